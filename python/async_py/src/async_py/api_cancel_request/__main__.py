@@ -1,6 +1,9 @@
 """
 Check if an endpoint in a Starlette async API continues processing
 when the client has cancelled the request.
+
+It does unless something cancels it: the CancelOnDisconnectMiddleware does when the client disconnects,
+`curl localhost:8000/test` then Ctrl+C shows the task cancelled and GET /stats the work abandoned.
 """
 
 import asyncio
@@ -8,10 +11,13 @@ import logging
 
 import uvicorn
 from starlette.applications import Starlette
+from starlette.middleware import Middleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 from starlette.routing import Route
 
+from async_py.api_cancel_request.middleware import CancelOnDisconnectMiddleware, DisconnectStats
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -44,11 +50,21 @@ async def test_endpoint(_: Request) -> JSONResponse:  # noqa: PT019
         return JSONResponse({"status": "error", "message": str(e)})
 
 
+disconnect_stats = DisconnectStats()
+
+
+async def stats_endpoint(_: Request) -> JSONResponse:
+    return JSONResponse(
+        {"abandoned": disconnect_stats.abandoned, "abandoned_seconds": disconnect_stats.abandoned_seconds}
+    )
+
+
 routes = [
     Route("/test", test_endpoint, methods=["GET"]),
+    Route("/stats", stats_endpoint, methods=["GET"]),
 ]
 
-app = Starlette(routes=routes)
+app = Starlette(routes=routes, middleware=[Middleware(CancelOnDisconnectMiddleware, stats=disconnect_stats)])
 
 if __name__ == "__main__":
     logger.info("Starting server on http://localhost:8000")
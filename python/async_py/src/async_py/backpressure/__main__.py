@@ -0,0 +1,78 @@
+"""
+Producers faster than their consumer, with each way of pushing back.
+
+Unbounded, the queue depth and its memory grow for as long as it runs.
+Bounded, the depth stays put and the cost moves to the producers: time waiting, or items dropped or rejected.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+
+from async_py.backpressure.queue import BoundedQueue, Policy
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+PRODUCERS = 1_000
+DURATION = 1
+PAYLOAD = b"x" * 100
+CONSUMER_BATCH = 100
+CONSUMER_PAUSE = 0.001
+
+
+async def produce(queue: BoundedQueue[bytes]) -> None:
+    while True:
+        with suppress(asyncio.QueueFull):
+            await queue.put(PAYLOAD)
+        await asyncio.sleep(0)
+
+
+async def consume(queue: BoundedQueue[bytes], peaks: list[int]) -> None:
+    """
+    A slow consumer: pauses every CONSUMER_BATCH items.
+    """
+    consumed = 0
+    while True:
+        await queue.get()
+        consumed += 1
+        if not consumed % CONSUMER_BATCH:
+            peaks[0] = max(peaks[0], queue.qsize())
+            peaks[1] = max(peaks[1], queue.nbytes())
+            await asyncio.sleep(CONSUMER_PAUSE)
+
+
+async def run(name: str, queue: BoundedQueue[bytes]) -> None:
+    peaks = [0, 0]
+    tasks = [asyncio.create_task(produce(queue)) for _ in range(PRODUCERS)]
+    tasks.append(asyncio.create_task(consume(queue, peaks)))
+    await asyncio.sleep(DURATION)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    stats = queue.stats
+    waits = stats.wait_percentiles()
+    logger.info(
+        f"{name:>24}: {stats.puts / DURATION:7.0f} puts/s, max depth {peaks[0]:6}, max {peaks[1] / 1024:6.0f}KiB, "
+        f"dropped {stats.dropped:6}, rejected {stats.rejected:6}, pauses {stats.pauses:4}, "
+        f"producer wait p50 {waits.p50 * 1000:.3f}ms p99 {waits.p99 * 1000:.3f}ms"
+    )
+
+
+async def main() -> None:
+    start_time = time.perf_counter()
+    await run("unbounded", BoundedQueue())
+    await run("block 1000 items", BoundedQueue(maxsize=1000))
+    await run("block 100KiB 80%/20%", BoundedQueue(maxbytes=100 * 1024, high_watermark=0.8, low_watermark=0.2))
+    await run("drop_oldest 1000 items", BoundedQueue(maxsize=1000, policy=Policy.DROP_OLDEST))
+    await run("reject 1000 items", BoundedQueue(maxsize=1000, policy=Policy.REJECT))
+    logger.info(f"Done in {time.perf_counter() - start_time:.2f}s")
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
@@ -0,0 +1,206 @@
+"""
+A queue bounded by item count and/or memory, which pushes back on its producers.
+
+When a put would go over `maxsize` items or `maxbytes` the policy decides:
+- block: put() waits for room, put_nowait() raises QueueFull
+- drop_oldest: the oldest items are dropped to make room and counted
+- reject: the put raises QueueFull and is counted
+
+Independently of the bound, watermarks are fractions of it for admission control:
+once the queue fills to `high_watermark` put() pauses every producer until the consumer drains it below `low_watermark`.
+Paused producers resume one at a time in arrival order, each one waking the next after its put,
+so a resume does not wake 100k producers at once.
+
+Item sizes come from `sizeof`, sys.getsizeof by default: shallow, cheap, good enough for a budget.
+How long each put() waited goes to a histogram, its percentiles show where throughput saturates.
+"""
+
+import asyncio
+import sys
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+from async_py.loop_monitor.monitor import Histogram, Percentiles
+
+
+class Policy(StrEnum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    REJECT = "reject"
+
+
+@dataclass
+class BackpressureStats:
+    puts: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    pauses: int = 0
+    waits: Histogram = field(default_factory=Histogram)
+
+    def wait_percentiles(self) -> Percentiles:
+        return Percentiles.from_histogram(self.waits)
+
+
+class BoundedQueue[T]:
+    def __init__(
+        self,
+        maxsize: int = 0,
+        maxbytes: int = 0,
+        policy: Policy = Policy.BLOCK,
+        high_watermark: float | None = None,
+        low_watermark: float | None = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+    ) -> None:
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.policy = policy
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark if low_watermark is not None else high_watermark
+        self.sizeof = sizeof
+        self.stats = BackpressureStats()
+        self.paused = False
+        self._items: deque[tuple[T, int]] = deque()
+        self._nbytes = 0
+        self._getters: deque[asyncio.Future[None]] = deque()
+        self._putters: deque[asyncio.Future[None]] = deque()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def level(self) -> float:
+        """
+        How full the queue is, as a fraction of the tightest bound.
+        """
+        level = 0.0
+        if self.maxsize:
+            level = len(self._items) / self.maxsize
+        if self.maxbytes:
+            level = max(level, self._nbytes / self.maxbytes)
+        return level
+
+    def _overflows(self, size: int) -> bool:
+        """
+        An item larger than `maxbytes` still goes into an empty queue, or it could never go anywhere.
+        """
+        if self.maxsize and len(self._items) >= self.maxsize:
+            return True
+        return bool(self.maxbytes and self._items and self._nbytes + size > self.maxbytes)
+
+    def _update_paused(self) -> None:
+        if self.high_watermark is None or self.low_watermark is None:
+            return
+        if self.paused:
+            if self.level() < self.low_watermark:
+                self.paused = False
+        elif self.level() >= self.high_watermark:
+            self.paused = True
+            self.stats.pauses += 1
+
+    def _wake_putter(self) -> None:
+        while self._putters:
+            future = self._putters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+
+    def _wake_getter(self) -> None:
+        while self._getters:
+            future = self._getters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+
+    def _put(self, item: T, size: int) -> None:
+        if self._overflows(size):
+            if self.policy is Policy.DROP_OLDEST:
+                while self._overflows(size):
+                    _, dropped_size = self._items.popleft()
+                    self._nbytes -= dropped_size
+                    self.stats.dropped += 1
+            else:
+                if self.policy is Policy.REJECT:
+                    self.stats.rejected += 1
+                raise asyncio.QueueFull
+        self._items.append((item, size))
+        self._nbytes += size
+        self.stats.puts += 1
+        self._update_paused()
+        if self._getters:
+            self._wake_getter()
+
+    def put_nowait(self, item: T) -> None:
+        """
+        Ignores the watermarks, only the bound and the policy apply.
+        """
+        self._put(item, self.sizeof(item))
+
+    def _must_wait(self, size: int) -> bool:
+        return self.paused or (self.policy is Policy.BLOCK and self._overflows(size))
+
+    async def put(self, item: T) -> None:
+        size = self.sizeof(item)
+        while self._putters and self._putters[0].done():
+            self._putters.popleft()
+        if self._putters or self._must_wait(size):
+            start_time = time.perf_counter()
+            try:
+                await self._wait_for_room(size)
+            finally:
+                self.stats.waits.add(time.perf_counter() - start_time)
+        else:
+            self.stats.waits.add(0)
+        self._put(item, size)
+        if self._putters and not self._must_wait(0):
+            self._wake_putter()
+
+    async def _wait_for_room(self, size: int) -> None:
+        """
+        Waits at the back of the line the first time, at the front after a wake up that found no room.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._putters.append(future)
+        while True:
+            try:
+                await future
+            except asyncio.CancelledError:
+                # The cancelled future stays in line, skipped when its turn comes.
+                if future.done() and not future.cancelled():
+                    # Woken then cancelled: hand the turn over to the next producer.
+                    self._wake_putter()
+                raise
+            if not self._must_wait(size):
+                return
+            future = asyncio.get_running_loop().create_future()
+            self._putters.appendleft(future)
+
+    def get_nowait(self) -> T:
+        if not self._items:
+            raise asyncio.QueueEmpty
+        item, size = self._items.popleft()
+        self._nbytes -= size
+        self._update_paused()
+        if self._putters and not self.paused:
+            self._wake_putter()
+        return item
+
+    async def get(self) -> T:
+        while not self._items:
+            future = asyncio.get_running_loop().create_future()
+            self._getters.append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled() and self._items:
+                    self._wake_getter()
+                raise
+        return self.get_nowait()
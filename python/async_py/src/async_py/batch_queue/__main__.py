@@ -0,0 +1,83 @@
+"""
+Per item cost of a high fan-in queue, as in sequence_failure: many producers, one consumer.
+
+Each producer puts one item then yields, the consumer takes them either one await per item from an asyncio.Queue,
+or one await per batch from a BatchQueue.
+The last case has the producers hand their items over in batches with put_many.
+"""
+
+import asyncio
+import logging
+import time
+
+from async_py.batch_queue.queue import BatchQueue
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+PRODUCERS = 10_000
+ROUNDS = 20
+ITEMS = PRODUCERS * ROUNDS
+BATCH_SIZE = 1024
+
+
+async def produce(queue: asyncio.Queue[int] | BatchQueue[int], name: int) -> None:
+    for i in range(ROUNDS):
+        await queue.put(name * ROUNDS + i)
+        await asyncio.sleep(0)
+
+
+async def produce_many(queue: BatchQueue[int], name: int) -> None:
+    for i in range(0, ROUNDS, 5):
+        await queue.put_many(range(name * ROUNDS + i, name * ROUNDS + i + 5))
+        await asyncio.sleep(0)
+
+
+async def consume(queue: asyncio.Queue[int]) -> int:
+    awaits = 0
+    for _ in range(ITEMS):
+        await queue.get()
+        awaits += 1
+    return awaits
+
+
+async def consume_many(queue: BatchQueue[int]) -> int:
+    awaits = received = 0
+    last = [-1] * PRODUCERS
+    while received < ITEMS:
+        batch = await queue.get_many(BATCH_SIZE)
+        awaits += 1
+        received += len(batch)
+        for item in batch:
+            name = item // ROUNDS
+            assert item > last[name], "FIFO order violated"
+            last[name] = item
+    return awaits
+
+
+async def run(name: str) -> tuple[float, int]:
+    start_time = time.perf_counter()
+    if name == "asyncio.Queue":
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        consumer = asyncio.create_task(consume(queue))
+        await asyncio.gather(*[produce(queue, i) for i in range(PRODUCERS)])
+    else:
+        batch_queue: BatchQueue[int] = BatchQueue()
+        consumer = asyncio.create_task(consume_many(batch_queue))
+        producer = produce_many if name == "BatchQueue put_many" else produce
+        await asyncio.gather(*[producer(batch_queue, i) for i in range(PRODUCERS)])
+    awaits = await consumer
+    return time.perf_counter() - start_time, awaits
+
+
+async def main() -> None:
+    for name in ["asyncio.Queue", "BatchQueue", "BatchQueue put_many"]:
+        elapsed, awaits = await run(name)
+        logger.info(f"{name:>19}: {elapsed / ITEMS * 1e9:6.0f}ns per item, {awaits} consumer awaits for {ITEMS} items")
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
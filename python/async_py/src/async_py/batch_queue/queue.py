@@ -0,0 +1,157 @@
+"""
+A FIFO queue moving items in batches.
+
+asyncio.Queue wakes the consumer once per item: one future, one call_soon and one task step for each get().
+Here a consumer asks for up to `max_items` in a single await and is woken once for the whole batch,
+and producers can hand a batch over with a single put_many().
+
+get_many(max_items) returns as soon as there is at least one item, with everything available up to `max_items`.
+get_many(max_items, max_wait) waits for `max_items` to be available, or for `max_wait` seconds, whichever comes first,
+and returns what is there then, possibly nothing.
+Items come out in the order they went in, whatever the batch sizes.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Iterable
+from contextlib import suppress
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class BatchQueue[T]:
+    def __init__(self, maxsize: int = 0) -> None:
+        self.maxsize = maxsize
+        self._items: deque[T] = deque()
+        self._getters: deque[tuple[int, asyncio.Future[None]]] = deque()
+        self._putters: deque[asyncio.Future[None]] = deque()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= len(self._items)
+
+    def _wake_getter(self) -> None:
+        """
+        Only the first getter is woken, and only once enough items are there for it.
+        """
+        while self._getters:
+            needed, future = self._getters[0]
+            if future.done():
+                self._getters.popleft()
+                continue
+            if len(self._items) >= needed:
+                future.set_result(None)
+            return
+
+    def _wake_putters(self, freed: int = 1) -> None:
+        """
+        One putter per freed slot: a woken putter has not put yet, full() does not tell when to stop.
+        """
+        while self._putters and freed > 0:
+            future = self._putters.popleft()
+            if not future.done():
+                future.set_result(None)
+                freed -= 1
+
+    def put_nowait(self, item: T) -> None:
+        if self.full():
+            raise asyncio.QueueFull
+        self._items.append(item)
+        if self._getters:
+            self._wake_getter()
+
+    def put_many_nowait(self, items: Iterable[T]) -> None:
+        """
+        All or nothing: raises QueueFull without adding anything if the items do not fit.
+        """
+        items = list(items)
+        if self.maxsize > 0 and len(self._items) + len(items) > self.maxsize:
+            raise asyncio.QueueFull
+        self._items.extend(items)
+        if self._getters:
+            self._wake_getter()
+
+    async def _wait_for_room(self) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._putters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done():
+                # Woken then cancelled: pass the room on to the next producer.
+                self._wake_putters()
+            raise
+
+    async def put(self, item: T) -> None:
+        while self.full():
+            await self._wait_for_room()
+        self.put_nowait(item)
+
+    async def put_many(self, items: Iterable[T]) -> None:
+        """
+        On a bounded queue, items go in as room frees up, so a batch larger than maxsize does not block forever.
+        """
+        pending = deque(items)
+        while pending:
+            while self.full():
+                await self._wait_for_room()
+            room = self.maxsize - len(self._items) if self.maxsize > 0 else len(pending)
+            self._items.extend(pending.popleft() for _ in range(min(room, len(pending))))
+            if self._getters:
+                self._wake_getter()
+
+    def get_nowait(self) -> T:
+        if not self._items:
+            raise asyncio.QueueEmpty
+        item = self._items.popleft()
+        if self._putters:
+            self._wake_putters()
+        return item
+
+    def get_many_nowait(self, max_items: int) -> list[T]:
+        items = self._items
+        batch = [items.popleft() for _ in range(min(max_items, len(items)))]
+        if self._putters:
+            self._wake_putters(len(batch))
+        if items and self._getters:
+            self._wake_getter()
+        return batch
+
+    async def get(self) -> T:
+        return (await self.get_many(1))[0]
+
+    async def _wait_for_items(self, needed: int, max_wait: float | None) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (needed, future)
+        self._getters.append(waiter)
+        timer = loop.call_later(max_wait, _wake, future) if max_wait is not None else None
+        try:
+            await future
+        except asyncio.CancelledError:
+            if self._items:
+                # Woken then cancelled: pass the items on to the next consumer.
+                self._wake_getter()
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            with suppress(ValueError):
+                self._getters.remove(waiter)
+
+    async def get_many(self, max_items: int, max_wait: float | None = None) -> list[T]:
+        if max_wait is None:
+            # Another consumer may have taken the items between the wake up and now.
+            while not self._items:
+                await self._wait_for_items(1, None)
+        elif len(self._items) < max_items:
+            await self._wait_for_items(max_items, max_wait)
+        return self.get_many_nowait(max_items)
@@ -0,0 +1,75 @@
+"""
+Turn over a 1024 entries cache every interval, as a cache of the log messages seen per interval does.
+
+TTLCache: the interval is formatted in the key and every entry expires on its own.
+BucketCache: the key is the message alone and the whole bucket expires at once.
+A fake clock makes the intervals go by without sleeping.
+"""
+
+import logging
+import time
+from collections.abc import Callable, Hashable, MutableMapping
+from typing import Any
+
+from cachetools import TTLCache
+
+from async_py.bucket_cache.cache import BucketCache
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+MAXSIZE = 1024
+INTERVAL = 5
+INTERVALS = 200
+LOOKUPS = 10
+MESSAGES = [f"Message delivery failed {i}" for i in range(MAXSIZE)]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run(name: str, cache: MutableMapping[Hashable, Any], clock: FakeClock, key: Callable[[str], Hashable]) -> None:
+    misses = 0
+    first_set = 0.0
+    start_time = time.perf_counter()
+    for _ in range(INTERVALS):
+        k = key(MESSAGES[0])
+        first_set_start = time.perf_counter()
+        cache[k] = True  # pays for the expiry of the previous interval
+        first_set += time.perf_counter() - first_set_start
+        for _ in range(LOOKUPS):
+            for message in MESSAGES:
+                k = key(message)
+                if k not in cache:
+                    misses += 1
+                    cache[k] = True
+        clock.now += INTERVAL
+    elapsed = time.perf_counter() - start_time
+    lookups = INTERVALS * LOOKUPS * MAXSIZE
+    logger.info(
+        f"{name:>12}: {elapsed / lookups * 1e9:.0f}ns per lookup, "
+        f"{first_set / INTERVALS * 1e6:.1f}us for the first set of an interval, {misses=}"
+    )
+
+
+def main() -> None:
+    ttl_clock = FakeClock()
+    ttl_cache: TTLCache[Hashable, Any] = TTLCache(maxsize=MAXSIZE, ttl=INTERVAL, timer=ttl_clock)
+    run("TTLCache", ttl_cache, ttl_clock, lambda message: f"{message}{ttl_clock() // INTERVAL}")
+
+    bucket_clock = FakeClock()
+    bucket_cache = BucketCache(maxsize=MAXSIZE, interval=INTERVAL, timer=bucket_clock)
+    run("BucketCache", bucket_cache, bucket_clock, lambda message: message)
+    logger.info(f"{bucket_cache.expired_buckets=}")
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    main()
@@ -0,0 +1,109 @@
+"""
+A cache whose entries expire together, by time bucket aligned on the clock.
+
+Time is cut in intervals aligned on the epoch (every minute on the minute for `interval=60`).
+An entry belongs to the bucket of the interval it was set in and lives for `buckets` intervals.
+The buckets form a ring of dicts: expiring a bucket replaces one dict, whatever the number of entries in it.
+
+It replaces a TTLCache with the interval in its keys, where every entry expires on its own.
+"""
+
+import time
+from collections.abc import Callable, Hashable, Iterator, MutableMapping
+from typing import Any
+
+
+class BucketCache(MutableMapping[Hashable, Any]):
+    def __init__(
+        self,
+        maxsize: int,
+        interval: float,
+        buckets: int = 1,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        if buckets < 1:
+            raise ValueError(f"buckets ({buckets}) must be at least 1")
+        self.maxsize = maxsize
+        self.interval = interval
+        self.timer = timer
+        self._ring: list[dict[Hashable, Any]] = [{} for _ in range(buckets)]
+        self._epoch = self._current_epoch()
+        self.expired_buckets = 0
+
+    def _current_epoch(self) -> int:
+        return int(self.timer() // self.interval)
+
+    def _rotate(self) -> int:
+        """
+        Expire the buckets which went out of the ring since the last call, return the current epoch.
+        """
+        epoch = self._current_epoch()
+        if epoch != self._epoch:
+            size = len(self._ring)
+            for expired in range(self._epoch + 1, min(epoch, self._epoch + size) + 1):
+                if self._ring[expired % size]:
+                    self._ring[expired % size] = {}
+                    self.expired_buckets += 1
+            self._epoch = epoch
+        return epoch
+
+    def _live_buckets(self) -> list[dict[Hashable, Any]]:
+        """
+        From the newest to the oldest.
+        """
+        epoch = self._rotate()
+        size = len(self._ring)
+        return [self._ring[(epoch - age) % size] for age in range(size)]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        epoch = self._rotate()
+        ring = self._ring
+        size = len(ring)
+        for age in range(size):
+            bucket = ring[(epoch - age) % size]
+            if key in bucket:
+                return bucket[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        epoch = self._rotate()
+        ring = self._ring
+        size = len(ring)
+        for age in range(size):  # noqa: SIM110, any() and its generator cost more than the lookup itself
+            if key in ring[(epoch - age) % size]:
+                return True
+        return False
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        current, *older = self._live_buckets()
+        for bucket in older:
+            bucket.pop(key, None)
+        if key not in current and len(self) >= self.maxsize:
+            self._evict()
+        current[key] = value
+
+    def __delitem__(self, key: Hashable) -> None:
+        found = False
+        for bucket in self._live_buckets():
+            if key in bucket:
+                del bucket[key]
+                found = True
+        if not found:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        for bucket in self._live_buckets():
+            yield from list(bucket)
+
+    def __len__(self) -> int:
+        self._rotate()
+        return sum(len(bucket) for bucket in self._ring)
+
+    def _evict(self) -> None:
+        """
+        Drop the oldest entry of the oldest non empty bucket.
+        """
+        for bucket in reversed(self._live_buckets()):
+            if bucket:
+                del bucket[next(iter(bucket))]
+                return
@@ -0,0 +1,56 @@
+"""
+Micro-benchmark of cache keys for a url and its query parameters.
+
+Formatting the url with yarl is the workaround shown in hashable_cache.
+The structural key freezes the parameters and lets the cache hash them.
+"""
+
+import logging
+import timeit
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import yarl
+from cachetools import TTLCache
+
+from async_py.cache_key.keys import structural_key
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+URL = "http://example.com"
+PARAMS = {"color": "blue", "limit": 10, "sort": "true"}
+NUMBER = 100_000
+
+
+def yarl_key(url: str, params: dict[str, Any]) -> Hashable:
+    return str(yarl.URL(url).with_query(params))
+
+
+def bench(name: str, key: Callable[[str, dict[str, Any]], Hashable]) -> None:
+    cache: TTLCache[Hashable, int] = TTLCache(maxsize=128, ttl=60)
+    cache[key(URL, PARAMS)] = 1
+
+    def lookup() -> int:
+        return cache[key(URL, PARAMS)]
+
+    key_time = timeit.timeit(lambda: key(URL, PARAMS), number=NUMBER) / NUMBER
+    lookup_time = timeit.timeit(lookup, number=NUMBER) / NUMBER
+    logger.info(f"{name:>10}: key {key_time * 1e6:.2f}us, key + cache hit {lookup_time * 1e6:.2f}us")
+
+
+def main() -> None:
+    assert structural_key(URL, PARAMS) == structural_key(URL, dict(reversed(PARAMS.items())))
+    assert structural_key(URL, {"tags": {"a", "b"}}) == structural_key(URL, {"tags": {"b", "a"}})
+    assert structural_key(URL, {"a": 1}) != structural_key(URL, {("a", 1)})
+    # The formatted url keeps the insertion order, the same parameters in another order are a cache miss.
+    assert yarl_key(URL, PARAMS) != yarl_key(URL, dict(reversed(PARAMS.items())))
+    bench("yarl", yarl_key)
+    bench("structural", structural_key)
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    main()
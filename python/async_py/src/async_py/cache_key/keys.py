@@ -0,0 +1,49 @@
+"""
+Cache keys for coroutines called with unhashable arguments.
+
+Dicts, lists and sets are frozen into their structural equivalent (frozenset, tuple)
+so the key is hashed from the values themselves, no string is built on the way.
+Dicts and sets compare without regard to their insertion order.
+Containers of hashable values are frozen in one C call, only nested containers are walked.
+"""
+
+from collections.abc import Hashable, Mapping
+from typing import Any
+
+from cachetools.keys import hashkey
+
+_ATOMIC = frozenset({str, int, float, bool, bytes, type(None)})
+
+
+class _MappingMark:
+    """Tags a frozen mapping so it never equals a frozen set of pairs. Classes keep their identity when pickled."""
+
+
+def freeze(value: Any) -> Hashable:
+    value_type = type(value)
+    if value_type in _ATOMIC:
+        return value  # type: ignore[no-any-return]
+    if isinstance(value, Mapping):
+        try:
+            return (_MappingMark, frozenset(value.items()))
+        except TypeError:  # unhashable values, freeze them one by one
+            return (_MappingMark, frozenset([(k, freeze(v)) for k, v in value.items()]))
+    if value_type is set:
+        return frozenset(value)
+    if value_type is list or value_type is tuple:
+        frozen = tuple(value)
+        try:
+            hash(frozen)
+        except TypeError:
+            return tuple([freeze(v) for v in value])
+        return frozen
+    return value  # type: ignore[no-any-return]
+
+
+def structural_key(*args: Any, **kwargs: Any) -> Hashable:
+    """
+    Drop-in for the `key=` parameter of asyncache.cached and the async_py cached decorators.
+    """
+    if kwargs:
+        return hashkey(*[freeze(arg) for arg in args], **{name: freeze(arg) for name, arg in kwargs.items()})
+    return hashkey(*[freeze(arg) for arg in args])
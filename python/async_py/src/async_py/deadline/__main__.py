@@ -0,0 +1,86 @@
+"""
+Requests with 0.5s to answer, as task_group.main and nursery.main with a deadline:
+- the children of a TaskGroup, the slow one cut at the deadline of the request
+- a detached Nursery task, cut too because it inherited the deadline through bounded()
+- a retried call to a dependency refusing at once, which stops retrying when the next attempt would start
+  past the deadline: attempts that take no time cannot be cut, the retries always stop before the deadline
+"""
+
+import asyncio
+import logging
+import time
+
+from async_py.deadline.deadline import STATS, Deadline, bounded, remaining
+from async_py.nursery.nursery import Nursery
+from async_py.retry.retry import retry
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+DEADLINE = 0.5
+
+
+class CustomError(Exception):
+    """Custom error"""
+
+
+async def child(name: str, duration: float) -> None:
+    time_left = remaining()
+    logger.debug(f"{name} starts with {time_left and f'{time_left:.3f}s'} left for {duration}s of work")
+    try:
+        await asyncio.sleep(duration)
+    except asyncio.CancelledError:
+        logger.debug(f"{name} cut")
+        raise
+    logger.debug(f"{name} done")
+
+
+@retry(attempts=10, retry_on=CustomError, base=0.1, budget=None)
+async def failing_dependency() -> None:
+    await asyncio.sleep(0)
+    raise CustomError("Still down")
+
+
+async def task_group_request() -> None:
+    try:
+        async with Deadline(DEADLINE), asyncio.TaskGroup() as tg:
+            tg.create_task(child("fast child", 0.1))
+            tg.create_task(child("slow child", 2))
+    except TimeoutError:
+        logger.info("TaskGroup request timed out")
+
+
+async def nursery_request(nursery: Nursery) -> None:
+    async with Deadline(DEADLINE):
+        nursery.create_task(bounded(child("detached child", 2)))
+        await child("request", 0.1)
+
+
+async def retried_request() -> None:
+    start_time = time.perf_counter()
+    try:
+        async with Deadline(DEADLINE):
+            await failing_dependency()
+    except CustomError:
+        logger.info(f"Retries given up after {time.perf_counter() - start_time:.3f}s, before the deadline")
+    except TimeoutError:
+        logger.info(f"Attempt cut at the deadline after {time.perf_counter() - start_time:.3f}s")
+
+
+async def main() -> None:
+    await task_group_request()
+
+    nursery = Nursery(asyncio.TimeoutError)
+    await nursery_request(nursery)
+    await asyncio.wait(list(nursery.tasks))
+
+    await retried_request()
+    logger.info(f"Retries: {failing_dependency.stats}")  # type: ignore[attr-defined]
+    logger.info(f"Deadlines: {STATS.scopes} scopes, {STATS.cut} cut")
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""
+Deadlines propagated to the sub-tasks through a context variable.
+
+asyncio.timeout bounds the coroutine that enters it, the tasks it created know nothing about it:
+a slow child of a TaskGroup or a Nursery keeps running after its parent gave up on its result.
+A Deadline is an asyncio.timeout that also sets the deadline in a ContextVar, which create_task copies:
+- a Deadline entered under another one can only make it earlier, never later
+- `async with Deadline():` without seconds enforces the deadline inherited from the parent task,
+  `bounded(coroutine)` does it for a coroutine handed over to a Nursery
+- retry does not sleep for a retry that would start past the deadline
+`remaining()` tells the code how much time is left, and the DeadlineStats count the scopes cut by their deadline.
+"""
+
+import asyncio
+from collections.abc import Awaitable
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from types import TracebackType
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+@dataclass
+class DeadlineStats:
+    scopes: int = 0
+    cut: int = 0
+
+
+STATS = DeadlineStats()
+
+
+def current() -> float | None:
+    """
+    The deadline of the current context, in loop time, None without one.
+    """
+    return _deadline.get()
+
+
+def remaining() -> float | None:
+    when = _deadline.get()
+    if when is None:
+        return None
+    return when - asyncio.get_running_loop().time()
+
+
+class Deadline:
+    def __init__(self, seconds: float | None = None, stats: DeadlineStats = STATS) -> None:
+        self.seconds = seconds
+        self.stats = stats
+        self.when: float | None = None
+        self._timeout = asyncio.timeout(None)
+        self._token: Token[float | None] | None = None
+
+    def expired(self) -> bool:
+        return self._timeout.expired()
+
+    async def __aenter__(self) -> "Deadline":
+        self.when = _deadline.get()
+        if self.seconds is not None:
+            when = asyncio.get_running_loop().time() + self.seconds
+            self.when = when if self.when is None else min(self.when, when)
+        self._token = _deadline.set(self.when)
+        self.stats.scopes += 1
+        await self._timeout.__aenter__()
+        self._timeout.reschedule(self.when)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._token is not None:
+            _deadline.reset(self._token)
+        try:
+            await self._timeout.__aexit__(exc_type, exc, traceback)
+        finally:
+            if self._timeout.expired():
+                self.stats.cut += 1
+
+
+async def bounded[T](awaitable: Awaitable[T]) -> T:
+    """
+    Awaits under the deadline of the context the coroutine was created in.
+    """
+    async with Deadline():
+        return await awaitable
@@ -0,0 +1,155 @@
+"""
+The same workloads on the stdlib loop and on uvloop, when it is installed:
+- sequence_failure: more producers than the loop keeps up with, run through its command line for the JSON report
+- multi_locks: tasks taking turns on a shared lock as in shared_lock, without the sleep, timing each acquisition
+- starlette: a JSON endpoint behind the CancelOnDisconnectMiddleware of api_cancel_request, served by uvicorn
+  on the loop to keep-alive clients
+"""
+
+import asyncio
+import json
+import logging
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from async_py.api_cancel_request.middleware import CancelOnDisconnectMiddleware
+from async_py.event_loop.loop import loop_factory, uvloop_installed
+from async_py.loop_monitor.monitor import Histogram, Percentiles
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+DURATION = 2
+PRODUCERS = 10_000
+SLEEP_TIME = 0.001
+LOCK_TASKS = 100
+CLIENTS = 20
+REQUEST = b"GET /stats HTTP/1.1\r\nHost: localhost\r\n\r\n"
+
+
+@dataclass
+class Result:
+    operations: int
+    elapsed: float
+    latency: Percentiles | None = None
+
+    @property
+    def per_second(self) -> float:
+        return self.operations / self.elapsed
+
+
+def sequence_failure(loop: str) -> Result:
+    command = [sys.executable, "-m", "async_py.sequence_failure", "--loop", loop]
+    command += ["--producers", str(PRODUCERS), "--sleep-time", str(SLEEP_TIME)]
+    command += ["--duration", str(DURATION), "--format", "json"]
+    output = subprocess.run(command, capture_output=True, check=True, text=True).stdout  # noqa: S603
+    report = json.loads(output)
+    return Result(report["items"], report["elapsed"])
+
+
+async def multi_locks() -> Result:
+    lock = asyncio.Lock()
+    waits = Histogram()
+    deadline = time.perf_counter() + DURATION
+
+    async def say_hello() -> None:
+        while time.perf_counter() < deadline:
+            start_time = time.perf_counter()
+            async with lock:
+                waits.add(time.perf_counter() - start_time)
+                await asyncio.sleep(0)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*[say_hello() for _ in range(LOCK_TASKS)])
+    return Result(waits.count, time.perf_counter() - start_time, Percentiles.from_histogram(waits))
+
+
+async def client(port: int, deadline: float, latencies: Histogram) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            start_time = time.perf_counter()
+            writer.write(REQUEST)
+            headers = await reader.readuntil(b"\r\n\r\n")
+            length = next(
+                int(line.split(b":")[1])
+                for line in headers.lower().split(b"\r\n")
+                if line.startswith(b"content-length")
+            )
+            await reader.readexactly(length)
+            latencies.add(time.perf_counter() - start_time)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def stats_endpoint(_: Request) -> JSONResponse:
+    return JSONResponse({"abandoned": 0, "abandoned_seconds": 0})
+
+
+app = Starlette(routes=[Route("/stats", stats_endpoint)], middleware=[Middleware(CancelOnDisconnectMiddleware)])
+
+
+async def starlette() -> Result:
+    # Listening before uvicorn starts: the clients connections wait in the backlog until it accepts them.
+    # IPPROTO_TCP explicitly, asyncio only sets TCP_NODELAY on sockets of that protocol,
+    # without it every response waits ~40ms for the delayed ACK of the client.
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen()
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off"))
+    serving = asyncio.create_task(server.serve(sockets=[sock]))
+
+    latencies = Histogram()
+    start_time = time.perf_counter()
+    deadline = start_time + DURATION
+    await asyncio.gather(*[client(port, deadline, latencies) for _ in range(CLIENTS)])
+    elapsed = time.perf_counter() - start_time
+
+    server.should_exit = True
+    await serving
+    return Result(latencies.count, elapsed, Percentiles.from_histogram(latencies))
+
+
+def run_on(loop: str, workload: Callable[[], Coroutine[Any, Any, Result]]) -> Result:
+    with asyncio.Runner(loop_factory=loop_factory(loop)) as runner:
+        return runner.run(workload())
+
+
+def report(name: str, results: dict[str, Result]) -> None:
+    baseline = results["asyncio"]
+    for loop, result in results.items():
+        line = f"{name:>16} on {loop:>7}: {result.per_second:9.0f}/s ({result.per_second / baseline.per_second:4.2f}x)"
+        if result.latency is not None:
+            line += f", p50 {result.latency.p50 * 1000:.3f}ms p99 {result.latency.p99 * 1000:.3f}ms"
+        logger.info(line)
+
+
+def main() -> None:
+    loops = ["asyncio", "uvloop"] if uvloop_installed() else ["asyncio"]
+    if len(loops) == 1:
+        logger.info("uvloop is not installed, `pip install async_py[uvloop]` to compare")
+
+    report("sequence_failure", {loop: sequence_failure(loop) for loop in loops})
+    report("multi_locks", {loop: run_on(loop, multi_locks) for loop in loops})
+    report("starlette", {loop: run_on(loop, starlette) for loop in loops})
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    main()
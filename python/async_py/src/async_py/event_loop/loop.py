@@ -0,0 +1,74 @@
+"""
+Event loop selection: uvloop when it is installed, the stdlib loop otherwise.
+
+uvloop is an optional dependency, `pip install async_py[uvloop]`, and "auto" picks it only when it can be imported.
+Every factory plugs into asyncio.Runner as SignalRunner does, with or without its signal handling:
+    with asyncio.Runner(loop_factory=signal_loop_factory()) as runner:
+        runner.run(main())
+"""
+
+import asyncio
+import importlib.util
+import signal
+from collections.abc import Callable, Iterable
+
+LOOPS = ("auto", "asyncio", "uvloop")
+
+
+def uvloop_installed() -> bool:
+    return importlib.util.find_spec("uvloop") is not None
+
+
+def available_loops() -> tuple[str, ...]:
+    """
+    The names resolve() accepts here: uvloop only when it is installed.
+    """
+    return LOOPS if uvloop_installed() else tuple(name for name in LOOPS if name != "uvloop")
+
+
+def resolve(name: str = "auto") -> str:
+    if name not in LOOPS:
+        msg = f"Unknown event loop {name!r}, expected one of {', '.join(LOOPS)}"
+        raise ValueError(msg)
+    if name == "auto":
+        return "uvloop" if uvloop_installed() else "asyncio"
+    if name == "uvloop" and not uvloop_installed():
+        msg = "uvloop is not installed, pip install async_py[uvloop]"
+        raise ValueError(msg)
+    return name
+
+
+def loop_factory(name: str = "auto") -> Callable[[], asyncio.AbstractEventLoop]:
+    if resolve(name) == "uvloop":
+        import uvloop
+
+        return uvloop.new_event_loop  # type: ignore[no-any-return]
+    return asyncio.new_event_loop
+
+
+def new_event_loop(name: str = "auto") -> asyncio.AbstractEventLoop:
+    return loop_factory(name)()
+
+
+def signal_loop_factory(
+    name: str = "auto",
+    signals: Iterable[signal.Signals] = (signal.SIGINT, signal.SIGTERM),
+) -> Callable[[], asyncio.AbstractEventLoop]:
+    """
+    A factory of loops cancelling all their tasks on `signals`, as signal_generator does.
+    """
+    factory = loop_factory(name)
+    signals = tuple(signals)
+
+    def new_loop() -> asyncio.AbstractEventLoop:
+        loop = factory()
+
+        def cancel_all_tasks() -> None:
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+
+        for sig in signals:
+            loop.add_signal_handler(sig, cancel_all_tasks)
+        return loop
+
+    return new_loop
@@ -0,0 +1,78 @@
+"""
+A server accepting a request every 50ms, each taking up to 3s, and streaming events from an async generator,
+that sends itself SIGTERM after a second: the short requests are drained, the generator is closed,
+and the requests still running after the 1s drain deadline are abandoned.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import signal
+from collections.abc import AsyncGenerator
+
+from async_py.graceful_shutdown.coordinator import ShutdownCoordinator
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+DRAIN_TIMEOUT = 1
+
+
+async def handle(request_id: int) -> None:
+    try:
+        await asyncio.sleep(random.uniform(0.1, 3))
+        logger.debug(f"Request {request_id} done")
+    except asyncio.CancelledError:
+        logger.debug(f"Request {request_id} abandoned")
+        raise
+
+
+async def events() -> AsyncGenerator[int]:
+    event_id = 0
+    try:
+        while True:
+            yield event_id
+            event_id += 1
+    finally:
+        logger.info(f"Event stream closed after {event_id} events")
+
+
+async def stream() -> None:
+    async for _ in events():
+        await asyncio.sleep(0.2)
+    logger.info("Event stream consumer done")
+
+
+async def serve(coordinator: ShutdownCoordinator) -> None:
+    loop = asyncio.get_running_loop()
+    loop.call_later(1, os.kill, os.getpid(), signal.SIGTERM)
+    handlers: set[asyncio.Task[None]] = set()
+    streamer = asyncio.create_task(stream())
+
+    request_id = 0
+    while not coordinator.stopping.is_set():
+        handler = asyncio.create_task(handle(request_id))
+        handlers.add(handler)
+        handler.add_done_callback(handlers.discard)
+        request_id += 1
+        await asyncio.sleep(0.05)
+    logger.info(f"Stopped accepting after {request_id} requests, {len(handlers)} in flight")
+
+    await asyncio.gather(streamer, *handlers, return_exceptions=True)
+
+
+def main() -> None:
+    coordinator = ShutdownCoordinator(drain_timeout=DRAIN_TIMEOUT)
+    with coordinator.runner() as runner:
+        try:
+            runner.run(serve(coordinator))
+        except asyncio.CancelledError:
+            logger.info(f"Server cancelled, {coordinator.abandoned} tasks abandoned")
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    main()
@@ -0,0 +1,100 @@
+"""
+Shut down on SIGINT/SIGTERM by draining the work in flight instead of cancelling everything at once.
+
+signal_generator cancels every task on the first signal: the work in flight is lost.
+Here the first signal goes through phases:
+1. stop accepting: `stopping` is set, producers check it or wait on it and stop taking new work
+2. drain: every task, the main one included, gets up to `drain_timeout` seconds to finish
+3. close the async generators not running, their cleanup runs and the loops consuming them end
+4. cancel whatever is left, the abandoned tasks, and give them `cancel_timeout` seconds to clean up
+A second signal skips to the last phase.
+Phase 3 needs the stdlib loop, the default: uvloop does not expose its async generators.
+
+It plugs into asyncio.Runner as SignalRunner does:
+    coordinator = ShutdownCoordinator(drain_timeout=10)
+    with asyncio.Runner(loop_factory=coordinator.loop_factory) as runner:
+        runner.run(main(coordinator))
+"""
+
+import asyncio
+import logging
+import signal
+from collections.abc import Iterable
+
+from async_py.event_loop.loop import new_event_loop
+
+logger = logging.getLogger(__name__)
+
+
+class ShutdownCoordinator:
+    def __init__(
+        self,
+        drain_timeout: float = 10,
+        cancel_timeout: float = 1,
+        signals: Iterable[signal.Signals] = (signal.SIGINT, signal.SIGTERM),
+        loop: str = "asyncio",
+    ) -> None:
+        self.drain_timeout = drain_timeout
+        self.cancel_timeout = cancel_timeout
+        self.signals = tuple(signals)
+        self.loop = loop
+        self.stopping = asyncio.Event()
+        self.drain_seconds = 0.0
+        self.drained = 0
+        self.closed_generators = 0
+        self.abandoned = 0
+        self._shutdown: asyncio.Task[None] | None = None
+
+    def loop_factory(self) -> asyncio.AbstractEventLoop:
+        loop = new_event_loop(self.loop)
+        if not hasattr(loop, "_asyncgens"):
+            logger.warning(
+                f"{type(loop).__name__} does not expose its async generators, "
+                "they will only be closed after the abandoned tasks are cancelled"
+            )
+        for sig in self.signals:
+            loop.add_signal_handler(sig, self.on_signal, loop, sig)
+        return loop
+
+    def runner(self) -> asyncio.Runner:
+        return asyncio.Runner(loop_factory=self.loop_factory)
+
+    def on_signal(self, loop: asyncio.AbstractEventLoop, sig: signal.Signals) -> None:
+        if self._shutdown is None:
+            logger.info(f"Received {sig.name}, draining for up to {self.drain_timeout}s")
+            self._shutdown = loop.create_task(self.shutdown(), name="shutdown")
+        else:
+            logger.info(f"Received {sig.name} again, cancelling everything")
+            for task in asyncio.all_tasks(loop):
+                if task is not self._shutdown:
+                    task.cancel()
+
+    async def shutdown(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.stopping.set()
+
+        start_time = loop.time()
+        in_flight = asyncio.all_tasks() - {asyncio.current_task()}
+        if in_flight:
+            done, in_flight = await asyncio.wait(in_flight, timeout=self.drain_timeout)
+            self.drained = len(done)
+        self.drain_seconds = loop.time() - start_time
+
+        # Generators being iterated right now can not be closed, the cancellation will take care of them.
+        # Only the stdlib loops expose the generators they track, see loop_factory.
+        tracked = getattr(loop, "_asyncgens", ())
+        generators = [agen for agen in list(tracked) if not agen.ag_running]
+        await asyncio.gather(*(agen.aclose() for agen in generators), return_exceptions=True)
+        self.closed_generators = len(generators)
+
+        in_flight = {task for task in in_flight if not task.done()}
+        self.abandoned = len(in_flight)
+        # Logged before cancelling: once the main task is done, asyncio.Runner cancels this one too.
+        logger.info(
+            f"Drained {self.drained} tasks in {self.drain_seconds:.2f}s, "
+            f"closed {self.closed_generators} async generators, cancelling {self.abandoned} abandoned tasks"
+        )
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.wait(in_flight, timeout=self.cancel_timeout)
@@ -1,10 +1,14 @@
 import asyncio
 import logging
+from collections.abc import Hashable
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from asyncache import cached
 from cachetools import TTLCache
+from cachetools.keys import hashkey
+
+from async_py.bucket_cache.cache import BucketCache
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
@@ -21,6 +25,19 @@ async def print_the_time_hash_key(dt: datetime, tz: ZoneInfo) -> None:
     logger.debug(f"It is {dt} in {tz}")
 
 
+def zone_key(_dt: datetime, tz: ZoneInfo) -> Hashable:
+    """
+    The bucket is the minute, no need to put it in the key.
+    """
+    return hashkey(tz)
+
+
+@cached(cache=BucketCache(maxsize=128, interval=60), key=zone_key)  # type: ignore[misc]
+async def print_the_time_bucket(dt: datetime, tz: ZoneInfo) -> None:
+    await asyncio.sleep(0.01)
+    logger.debug(f"It is {dt} in {tz}")
+
+
 async def print_the_time(dt: datetime, tz: ZoneInfo) -> None:
     await asyncio.sleep(0.01)
     logger.debug(f"It is {dt} in {tz}")
@@ -47,6 +64,13 @@ async def call_no_hash_key(zone: str) -> None:
         await print_the_time(dt, tz)
 
 
+async def call_bucket(zone: str) -> None:
+    async with lock:
+        tz = ZoneInfo(zone)
+        dt = datetime.now(tz=tz)
+        await print_the_time_bucket(dt, tz)
+
+
 async def main() -> None:
     for _ in range(3):
         for zone in ["Asia/Tokyo", "Europe/Paris", "America/Toronto"]:
@@ -59,6 +83,9 @@ async def main() -> None:
             for _ in range(3):
                 await asyncio.create_task(call_hash_key(zone))
         logger.debug("--")
+        for zone in ["Asia/Seoul", "Europe/Oslo", "America/Lima"]:
+            await asyncio.gather(*[call_bucket(zone) for _ in range(3)])
+        logger.debug("--")
         await asyncio.sleep(1)
 
 
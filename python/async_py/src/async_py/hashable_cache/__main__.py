@@ -1,5 +1,6 @@
 """
 Async function with a cache that cannot accept non hashable parameters.
+Unless the cache key freezes them, see async_py.cache_key.
 """
 
 import asyncio
@@ -11,6 +12,8 @@ import yarl
 from asyncache import cached
 from cachetools import TTLCache
 
+from async_py.cache_key.keys import structural_key
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
@@ -23,6 +26,14 @@ async def prepare_request(url: str, params: dict[str, Any] | None = None) -> Non
     logger.debug(req.url)
 
 
+@cached(cache=TTLCache(maxsize=1, ttl=10), key=structural_key)  # type: ignore[misc]
+async def prepare_request_structural_key(url: str, params: dict[str, Any] | None = None) -> None:
+    await asyncio.sleep(0.01)
+    req = requests.PreparedRequest()
+    req.prepare_url(url, params)
+    logger.debug(req.url)
+
+
 async def call_prepare_request_unhashable() -> None:
     url = "http://example.com"
     params = {"color": "blue", "limit": 10, "sort": "true"}
@@ -36,12 +47,19 @@ async def call_prepare_request_hashable() -> None:
     await asyncio.gather(*[prepare_request(full_url)])
 
 
+async def call_prepare_request_structural_key() -> None:
+    url = "http://example.com"
+    params = {"color": "blue", "limit": 10, "sort": "true"}
+    await asyncio.gather(*[prepare_request_structural_key(url, params)])
+
+
 async def main() -> None:
     try:
         await call_prepare_request_unhashable()
     except TypeError as error:
         logger.debug(error)
     await call_prepare_request_hashable()
+    await call_prepare_request_structural_key()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
 """
 Multiple levels of concurrency can bypass cache
 
-A lock is necessary for every level of concurrency
+A lock is necessary for every level of concurrency, one per zone so zones do not wait on each other,
+unless the cache coalesces concurrent callers for the same key (single flight).
 """
 
 import asyncio
@@ -12,10 +13,13 @@ from zoneinfo import ZoneInfo
 from asyncache import cached
 from cachetools import TTLCache
 
+from async_py.keyed_lock.lock import KeyedLock
+from async_py.single_flight.cache import cached as single_flight_cached
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
-lock = asyncio.Lock()
-lock2 = asyncio.Lock()
+locks = KeyedLock()
+locks2 = KeyedLock()
 
 
 def hash_key(dt: datetime, tz: ZoneInfo) -> str:
@@ -33,20 +37,45 @@ async def call_function(zone: str) -> None:
     With a lock, order is forced and the first call triggers the cache.
     Next calls use the cache.
     """
-    async with lock2:
+    async with locks2(zone):
         tz = ZoneInfo(zone)
         dt = datetime.now(tz=tz).replace(second=0, microsecond=0)
         await print_the_time(dt, tz)
 
 
 async def super_call_function(zone: str) -> None:
-    async with lock:
+    async with locks(zone):
         await asyncio.gather(*[call_function(zone) for _ in range(3)])
 
 
+@single_flight_cached(cache=TTLCache(maxsize=3, ttl=1))
+async def print_the_time_single_flight(dt: datetime, tz: ZoneInfo) -> None:
+    await asyncio.sleep(0.01)
+    task = asyncio.current_task()
+    logger.debug(f"It is {dt} in {tz} {task and task.get_name()}")
+
+
+async def call_function_single_flight(zone: str) -> None:
+    """
+    No lock, concurrent callers for the same key wait on the same in-flight call.
+    """
+    tz = ZoneInfo(zone)
+    dt = datetime.now(tz=tz).replace(second=0, microsecond=0)
+    await print_the_time_single_flight(dt, tz)
+
+
+async def super_call_function_single_flight(zone: str) -> None:
+    await asyncio.gather(*[call_function_single_flight(zone) for _ in range(3)])
+
+
 async def main() -> None:
     # Bypass the cache
     await asyncio.gather(*[super_call_function("Asia/Tokyo") for _ in range(100)])
+    logger.debug("--")
+    # One backend call per zone, zones do not wait on each other
+    await asyncio.gather(
+        *[super_call_function_single_flight(zone) for zone in ["Asia/Tokyo", "Europe/Paris"] for _ in range(100)]
+    )
 
 
 if __name__ == "__main__":
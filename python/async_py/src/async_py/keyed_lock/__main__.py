@@ -0,0 +1,62 @@
+"""
+Benchmark a single shared lock against a lock per key.
+
+With a single lock every caller waits in the same line whatever its key.
+With a keyed lock only callers of the same key are serialized.
+Locks are dropped once released, so the registry does not grow with the number of distinct keys.
+"""
+
+import asyncio
+import logging
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+
+from async_py.keyed_lock.lock import KeyedLock
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+KEYS = 200
+CALLS_PER_KEY = 5
+HOLD_TIME = 0.001
+
+
+async def worker(get_lock: Callable[[int], AbstractAsyncContextManager[None]], key: int) -> None:
+    async with get_lock(key):
+        await asyncio.sleep(HOLD_TIME)
+
+
+async def run(name: str, get_lock: Callable[[int], AbstractAsyncContextManager[None]]) -> None:
+    start_time = time.perf_counter()
+    await asyncio.gather(*[worker(get_lock, key) for key in range(KEYS) for _ in range(CALLS_PER_KEY)])
+    elapsed = time.perf_counter() - start_time
+    logger.info(f"{name:>12}: {KEYS * CALLS_PER_KEY / elapsed:10.0f} calls/s ({elapsed:.3f}s)")
+
+
+async def memory(distinct_keys: int, concurrency: int) -> None:
+    """
+    Go through many distinct keys, `concurrency` at a time: peak memory follows the concurrency only.
+    """
+    locks = KeyedLock()
+    tracemalloc.start()
+    for offset in range(0, distinct_keys, concurrency):
+        await asyncio.gather(*[worker(locks, key) for key in range(offset, offset + concurrency)])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    logger.info(f"{distinct_keys} distinct keys: {len(locks)} locks left, peak {peak / 1024 / 1024:.1f} MiB")
+
+
+async def main() -> None:
+    shared_lock = asyncio.Lock()
+    await run("shared lock", lambda _key: shared_lock)
+    await run("keyed lock", KeyedLock())
+    await memory(100_000, 1_000)
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
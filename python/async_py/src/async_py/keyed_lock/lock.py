@@ -0,0 +1,89 @@
+"""
+A registry of asyncio.Lock, one per key.
+
+A lock only exists while at least one coroutine holds it or waits on it.
+Each entry is refcounted and removed on the last release, so memory stays bounded
+by the number of keys in use at the same time, not by the number of keys ever seen.
+"""
+
+import asyncio
+from collections.abc import Hashable
+from types import TracebackType
+
+
+class _Entry:
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class KeyLock:
+    """
+    Handle on the lock of one key, usable wherever an asyncio.Lock is used with `async with`.
+    """
+
+    __slots__ = ("_key", "_registry")
+
+    def __init__(self, registry: "KeyedLock", key: Hashable) -> None:
+        self._registry = registry
+        self._key = key
+
+    def locked(self) -> bool:
+        return self._registry.locked(self._key)
+
+    async def acquire(self) -> bool:
+        return await self._registry.acquire(self._key)
+
+    def release(self) -> None:
+        self._registry.release(self._key)
+
+    async def __aenter__(self) -> None:
+        await self._registry.acquire(self._key)
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._registry.release(self._key)
+
+
+class KeyedLock:
+    def __init__(self) -> None:
+        self._entries: dict[Hashable, _Entry] = {}
+
+    def __call__(self, key: Hashable) -> KeyLock:
+        return KeyLock(self, key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def locked(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.lock.locked()
+
+    async def acquire(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry()
+        entry.users += 1
+        try:
+            return await entry.lock.acquire()
+        except BaseException:
+            self._discard(key, entry)
+            raise
+
+    def release(self, key: Hashable) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            raise RuntimeError(f"Lock for {key!r} is not acquired.")
+        entry.lock.release()
+        self._discard(key, entry)
+
+    def _discard(self, key: Hashable, entry: _Entry) -> None:
+        entry.users -= 1
+        if entry.users == 0:
+            del self._entries[key]
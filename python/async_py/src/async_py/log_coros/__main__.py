@@ -1,9 +1,9 @@
 import asyncio
 import logging
-import sys
 import time
 from contextlib import suppress
 
+from async_py.profiler.sampler import Profiler
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
@@ -58,14 +58,22 @@ async def main():
     await handle
 
 
+async def profiled_main():
+    """
+    Sampling instead of tracing: the cost does not depend on the number of calls.
+    """
+    async with Profiler() as profiler:
+        await main()
+    for name, times in profiler.task_times().items():
+        logger.debug(f"{name}: wall {times.wall:.3f}s, cpu {times.cpu:.3f}s")
+
+
 if __name__ == "__main__":
     logger.info("=" * 80)
     logger.info(f"Running {__file__}")
     logger.info("=" * 80)
-    sys.settrace(trace_calls)
-
     # enable_run()
     # enable_is_coroutine()
 
     with suppress(KeyboardInterrupt):
-        asyncio.run(main())
+        asyncio.run(profiled_main())
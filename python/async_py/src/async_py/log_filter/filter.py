@@ -0,0 +1,117 @@
+"""
+A logging.Filter suppressing identical records within an interval.
+
+Intervals are aligned on the clock, the same way as the BucketCache.
+The first record of a kind goes through, the next identical ones are only counted.
+When the interval is over, one summary record per suppressed kind says how many were dropped:
+a timer thread emits it at the end of the interval, or the first record of the next interval if it comes sooner.
+The summary goes straight to the handlers of the logger and its parents, not through the filters of the logger.
+
+The key of a record is its logger, level, unformatted message and arguments: no formatting on the hot path.
+Memory is bounded by `maxsize` kinds per interval, kinds over it are not suppressed.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Hashable
+
+_FRESH_ATTRIBUTES = frozenset({"created", "msecs", "relativeCreated", "exc_info", "exc_text"})
+
+
+class _Seen:
+    __slots__ = ("count", "first")
+
+    def __init__(self, first: logging.LogRecord) -> None:
+        self.first = first
+        self.count = 0
+
+
+class DuplicateFilter(logging.Filter):
+    def __init__(self, interval: float = 1, maxsize: int = 1024, name: str = "") -> None:
+        super().__init__(name)
+        self.interval = interval
+        self.maxsize = maxsize
+        self.suppressed = 0
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._seen: dict[Hashable, _Seen] = {}
+        self._timer: threading.Timer | None = None
+
+    @staticmethod
+    def _key(record: logging.LogRecord) -> Hashable:
+        key = (record.name, record.levelno, record.msg, record.args)
+        try:
+            hash(key)
+        except TypeError:
+            return (record.name, record.levelno, record.msg, repr(record.args))
+        return key
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not super().filter(record):
+            return False
+        if getattr(record, "duplicate_summary", False):  # its own summary, when the filter is on a handler
+            return True
+        key = self._key(record)
+        epoch = int(record.created // self.interval)
+        expired: dict[Hashable, _Seen] | None = None
+        with self._lock:
+            if epoch != self._epoch:
+                expired, self._seen, self._epoch = self._seen, {}, epoch
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            entry = self._seen.get(key)
+            if entry is not None:
+                entry.count += 1
+                self.suppressed += 1
+            elif len(self._seen) < self.maxsize:
+                self._seen[key] = _Seen(record)
+                if self._timer is None:
+                    self._schedule(epoch)
+        if expired:
+            self._summarize(expired)
+        return entry is None
+
+    def _schedule(self, epoch: int) -> None:
+        """
+        Called with the lock held, on the first record of an interval.
+        """
+        delay = max((epoch + 1) * self.interval - time.time(), 0)
+        self._timer = threading.Timer(delay, self._end_interval, (epoch,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _end_interval(self, epoch: int) -> None:
+        with self._lock:
+            if epoch != self._epoch:
+                # Summarized and cancelled by a record of a later interval, this timer was already running.
+                return
+            self._timer = None
+            expired, self._seen = self._seen, {}
+        self._summarize(expired)
+
+    def flush(self) -> None:
+        """
+        Summarize the current interval now, for example before exiting.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            expired, self._seen = self._seen, {}
+        self._summarize(expired)
+
+    def _summarize(self, expired: dict[Hashable, _Seen]) -> None:
+        """
+        The summary is a copy of the first record, timestamped now, handed to the handlers of its logger:
+        Logger.handle would run it through the filters of the logger again, this one included.
+        """
+        for seen in expired.values():
+            if not seen.count:
+                continue
+            attributes = {k: v for k, v in seen.first.__dict__.items() if k not in _FRESH_ATTRIBUTES}
+            attributes["msg"] = "%s (repeated %d more times in %ss)"
+            attributes["args"] = (seen.first.getMessage(), seen.count, self.interval)
+            attributes["duplicate_summary"] = True
+            logging.getLogger(seen.first.name).callHandlers(logging.makeLogRecord(attributes))
@@ -0,0 +1,79 @@
+"""
+Loop iterations per second of coroutines logging on every iteration, as in sequence.say_my_name.
+
+The records are written either from the event loop thread (plain StreamHandler)
+or from a background thread behind a bounded queue, with each overflow policy.
+Two sinks: a file, and a stream taking 0.1ms per line like a busy terminal.
+The queue holds MAXSIZE records: the slow stream cannot keep up with the coroutines and fills it,
+each policy then shows what it costs: the records dropped, or the time the loop was blocked.
+"""
+
+import asyncio
+import io
+import logging
+import time
+
+from async_py.log_queue.handler import OverflowPolicy, setup_queue_logging
+
+logger = logging.getLogger(__name__)
+
+COROUTINES = 4
+DURATION = 1
+MAXSIZE = 1_000
+
+
+class SlowStream(io.StringIO):
+    def write(self, s: str) -> int:
+        time.sleep(0.0001 * s.count("\n"))
+        return super().write(s)
+
+
+async def say_my_name(name: int, deadline: float) -> int:
+    iterations = 0
+    while time.monotonic() < deadline:
+        logger.debug(f"My name is: {name}")
+        await asyncio.sleep(0)
+        iterations += 1
+    return iterations
+
+
+async def run() -> float:
+    deadline = time.monotonic() + DURATION
+    iterations = await asyncio.gather(*[say_my_name(i, deadline) for i in range(COROUTINES)])
+    return sum(iterations) / DURATION
+
+
+def stream_handler(stream: io.StringIO) -> logging.Handler:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    return handler
+
+
+def main() -> None:
+    results: list[tuple[str, float, int, float]] = []
+    for sink, stream_type in [("file", io.StringIO), ("slow", SlowStream)]:
+        logging.basicConfig(level=logging.DEBUG, handlers=[stream_handler(stream_type())], force=True)
+        results.append((f"{sink} stream", asyncio.run(run()), 0, 0.0))
+
+        for policy in OverflowPolicy:
+            writer = setup_queue_logging(maxsize=MAXSIZE, policy=policy, handlers=[stream_handler(stream_type())])
+            iterations_per_second = asyncio.run(run())
+            writer.stop()
+            queue_handler = writer.queue_handler
+            results.append(
+                (f"{sink} queue {policy}", iterations_per_second, queue_handler.dropped, queue_handler.blocked)
+            )
+
+    logging.basicConfig(level=logging.DEBUG, force=True)
+    for name, iterations_per_second, dropped, blocked in results:
+        logger.info(
+            f"{name:>18}: {iterations_per_second:10.0f} iterations/s, dropped {dropped:>7}, blocked {blocked:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    main()
@@ -0,0 +1,177 @@
+"""
+Logging through a bounded queue, written to the real handlers by a background thread.
+
+The thread calling the logger (usually the event loop) only appends the record to a deque, under the handler lock
+taken by Handler.handle: no formatting, no syscall. Only the block policy waits, on the `not_full` Condition.
+The LogWriter thread wakes up every `flush_interval`, drains the queue and writes the whole batch at once,
+so a slow stderr or disk stalls the writer thread instead of the event loop.
+
+When the queue is full the overflow policy decides:
+- block: wait for room, nothing is lost but the loop can stall, for `blocked` seconds in total
+- drop: drop the record and count it
+- sample: over the high watermark keep one record every `sample_every`, drop when full
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from enum import StrEnum
+
+
+class OverflowPolicy(StrEnum):
+    BLOCK = "block"
+    DROP = "drop"
+    SAMPLE = "sample"
+
+
+class BoundedQueueHandler(logging.Handler):
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        policy: OverflowPolicy = OverflowPolicy.DROP,
+        high_watermark: float = 0.8,
+        sample_every: int = 10,
+    ) -> None:
+        super().__init__()
+        self.records: deque[logging.LogRecord] = deque()
+        self.maxsize = maxsize
+        self.policy = policy
+        self.high_watermark = int(maxsize * high_watermark)
+        self.sample_every = sample_every
+        self.dropped = 0
+        self.blocked = 0.0
+        self.not_full = threading.Condition()
+        self.wakeup = threading.Event()
+        self._sampled = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Called under the handler lock. The message is merged with its arguments in case they are mutated later,
+        the formatting is left to the writer thread. A message not matching its arguments goes to handleError,
+        as with the stdlib handlers, instead of raising in the caller.
+        """
+        if record.args:
+            try:
+                record.msg = record.getMessage()
+            except Exception:  # noqa: BLE001 # reported by handleError, as Handler.emit does
+                self.handleError(record)
+                return
+            record.args = None
+
+        size = len(self.records)
+        if size >= self.high_watermark:
+            self.wakeup.set()
+            if self.policy is OverflowPolicy.SAMPLE:
+                self._sampled += 1
+                if self._sampled % self.sample_every:
+                    self.dropped += 1
+                    return
+        if size >= self.maxsize:
+            if self.policy is not OverflowPolicy.BLOCK:
+                self.dropped += 1
+                return
+            start_time = time.perf_counter()
+            with self.not_full:
+                self.not_full.wait_for(lambda: len(self.records) < self.maxsize)
+            self.blocked += time.perf_counter() - start_time
+        self.records.append(record)
+
+
+class LogWriter:
+    def __init__(self, queue_handler: BoundedQueueHandler, *handlers: logging.Handler, flush_interval: float = 0.05):
+        self.queue_handler = queue_handler
+        self.handlers = handlers
+        self.flush_interval = flush_interval
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Remove the queue handler from the root logger, write what is left in the queue and wait for the thread to exit:
+        nothing would drain what is logged after.
+        """
+        logging.getLogger().removeHandler(self.queue_handler)
+        self._stopping = True
+        self.queue_handler.wakeup.set()
+        self._thread.join()
+        self.queue_handler.close()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self.queue_handler.wakeup.wait(self.flush_interval)
+            self.queue_handler.wakeup.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self) -> None:
+        records = self.queue_handler.records
+        batch = [records.popleft() for _ in range(len(records))]
+        if self.queue_handler.policy is OverflowPolicy.BLOCK:
+            with self.queue_handler.not_full:
+                self.queue_handler.not_full.notify_all()
+        if not batch:
+            return
+        for handler in self.handlers:
+            self._write(handler, [record for record in batch if record.levelno >= handler.level])
+
+    @staticmethod
+    def _write(handler: logging.Handler, batch: list[logging.LogRecord]) -> None:
+        """
+        A stream gets the whole batch in one write and one flush, other handlers get one record at a time.
+        Failures go to handleError, as in Handler.emit: one bad record must not stop the writer thread,
+        or the loggers would block on a full queue with the block policy.
+        """
+        if not isinstance(handler, logging.StreamHandler):
+            for record in batch:
+                handler.handle(record)
+            return
+        lines = []
+        for record in batch:
+            try:
+                if handler.filter(record):
+                    lines.append(handler.format(record) + handler.terminator)
+            except Exception:  # noqa: BLE001
+                handler.handleError(record)
+        if not lines:
+            return
+        handler.acquire()
+        try:
+            handler.stream.write("".join(lines))
+            handler.flush()
+        except Exception:  # noqa: BLE001
+            handler.handleError(batch[-1])
+        finally:
+            handler.release()
+
+
+def setup_queue_logging(
+    level: int = logging.DEBUG,
+    maxsize: int = 10_000,
+    policy: OverflowPolicy = OverflowPolicy.DROP,
+    handlers: list[logging.Handler] | None = None,
+) -> LogWriter:
+    """
+    Opt-in replacement for logging.basicConfig: the root logger only enqueues, `handlers` do the writing.
+    The handlers of the root logger are removed and closed, as basicConfig(force=True) does.
+    Call `stop()` on the returned writer before exiting to flush the queue, it also removes the queue handler.
+    """
+    if handlers is None:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        handlers = [stream_handler]
+
+    queue_handler = BoundedQueueHandler(maxsize, policy)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    writer = LogWriter(queue_handler, *handlers)
+    writer.start()
+    return writer
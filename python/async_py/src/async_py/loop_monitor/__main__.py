@@ -0,0 +1,68 @@
+"""
+Monitor a loop where one task blocks it from time to time.
+"""
+
+import asyncio
+import logging
+import time
+
+from async_py.loop_monitor.monitor import LoopMonitor, Snapshot
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+DURATION = 1.0
+
+
+async def busy(deadline: float) -> int:
+    iterations = 0
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0)
+        iterations += 1
+    return iterations
+
+
+async def blocking(deadline: float) -> int:
+    while time.monotonic() < deadline:
+        time.sleep(0.05)  # noqa: ASYNC251
+        await asyncio.sleep(0.2)
+    return 0
+
+
+async def run() -> float:
+    deadline = time.monotonic() + DURATION
+    iterations = await asyncio.gather(*[busy(deadline) for _ in range(4)], blocking(deadline))
+    return sum(iterations) / DURATION
+
+
+def log_snapshot(snapshot: Snapshot) -> None:
+    for name, percentiles in [("callbacks", snapshot.callbacks), ("lag", snapshot.lag)]:
+        logger.info(
+            f"{name:>9}: count {percentiles.count}, p50 {percentiles.p50 * 1000:.3f}ms, "
+            f"p99 {percentiles.p99 * 1000:.3f}ms, max {percentiles.max * 1000:.3f}ms"
+        )
+    for duration, name in snapshot.slowest[:3]:
+        logger.info(f"slow callback {duration * 1000:.1f}ms: {name}")
+
+
+async def main() -> None:
+    baseline = await run()
+
+    monitor = LoopMonitor()
+    start_time = time.perf_counter()
+    monitor.install()
+    installed = time.perf_counter() - start_time
+    exporter = asyncio.create_task(monitor.export(0.5, log_snapshot))
+    monitored = await run()
+    exporter.cancel()
+    monitor.uninstall()
+
+    logger.info(f"Installed in {installed * 1e6:.0f}us")
+    logger.info(f"{baseline:.0f} iterations/s without the monitor, {monitored:.0f} with it")
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
@@ -0,0 +1,172 @@
+"""
+Event loop monitor: how long callbacks run and how late the loop is.
+
+Same hook as log_coros.enable_run, asyncio.events.Handle._run, but timing each callback instead of logging it.
+Durations go to a histogram of fixed size, only the slowest callbacks get a name,
+so the memory and the cost per callback stay constant however long it runs.
+Loop lag is measured by a probe scheduled every `lag_interval`: how late it runs is how late everything runs.
+Only the stdlib loops run their callbacks through Handle._run, uvloop does not.
+"""
+
+import asyncio
+import heapq
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+class Histogram:
+    """
+    Buckets grow by powers of two from 1 microsecond, the last one catches everything above ~1 minute.
+    """
+
+    BUCKETS = 27
+
+    def __init__(self) -> None:
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        index = int(seconds * 1_000_000).bit_length()
+        self.counts[index if index < self.BUCKETS else -1] += 1
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def clear(self) -> None:
+        self.counts[:] = [0] * self.BUCKETS
+        self.count = 0
+        self.max = 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Upper bound of the bucket holding the percentile, capped by the max seen.
+        """
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min((1 << index) / 1_000_000, self.max)
+        return self.max
+
+
+@dataclass
+class Percentiles:
+    count: int
+    p50: float
+    p99: float
+    max: float
+
+    @classmethod
+    def from_histogram(cls, histogram: Histogram) -> "Percentiles":
+        return cls(histogram.count, histogram.percentile(50), histogram.percentile(99), histogram.max)
+
+
+@dataclass
+class Snapshot:
+    callbacks: Percentiles
+    lag: Percentiles
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+
+
+def callback_name(handle: asyncio.Handle) -> str:
+    callback = handle._callback  # type: ignore[attr-defined] # noqa: SLF001
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        return f"{owner.get_name()} {owner.get_coro().__qualname__}"  # type: ignore[union-attr]
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+class LoopMonitor:
+    def __init__(self, top: int = 10, lag_interval: float = 0.1) -> None:
+        self.top = top
+        self.lag_interval = lag_interval
+        self.callbacks = Histogram()
+        self.lag = Histogram()
+        self._slowest: list[tuple[float, str]] = []
+        self._slow_threshold = 0.0
+        self._original_run: Callable[[asyncio.Handle], None] | None = None
+        self._probe: asyncio.TimerHandle | None = None
+
+    def install(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """
+        Patch Handle._run for every loop of the process, and start the lag probe on `loop`.
+        """
+        if self._original_run is not None:
+            return
+        original_run = self._original_run = asyncio.events.Handle._run  # noqa: SLF001
+        perf_counter = time.perf_counter
+        add = self.callbacks.add
+
+        def timed_run(handle: asyncio.Handle) -> None:
+            start_time = perf_counter()
+            try:
+                original_run(handle)
+            finally:
+                duration = perf_counter() - start_time
+                add(duration)
+                if duration >= self._slow_threshold:
+                    self._record_slow(handle, duration)
+
+        asyncio.events.Handle._run = timed_run  # type: ignore[assignment] # noqa: SLF001
+        loop = loop or asyncio.get_running_loop()
+        self._schedule_probe(loop)
+
+    def uninstall(self) -> None:
+        if self._original_run is None:
+            return
+        asyncio.events.Handle._run = self._original_run  # type: ignore[assignment] # noqa: SLF001
+        self._original_run = None
+        if self._probe is not None:
+            self._probe.cancel()
+            self._probe = None
+
+    def _record_slow(self, handle: asyncio.Handle, duration: float) -> None:
+        """
+        Only called for callbacks slower than the fastest of the `top` slowest, the only ones which get a name.
+        """
+        if len(self._slowest) < self.top:
+            heapq.heappush(self._slowest, (duration, callback_name(handle)))
+        else:
+            heapq.heapreplace(self._slowest, (duration, callback_name(handle)))
+        if len(self._slowest) == self.top:
+            self._slow_threshold = self._slowest[0][0]
+
+    def _schedule_probe(self, loop: asyncio.AbstractEventLoop) -> None:
+        expected = loop.time() + self.lag_interval
+        self._probe = loop.call_at(expected, self._run_probe, loop, expected)
+
+    def _run_probe(self, loop: asyncio.AbstractEventLoop, expected: float) -> None:
+        self.lag.add(max(loop.time() - expected, 0))
+        self._schedule_probe(loop)
+
+    def snapshot(self) -> Snapshot:
+        return Snapshot(
+            callbacks=Percentiles.from_histogram(self.callbacks),
+            lag=Percentiles.from_histogram(self.lag),
+            slowest=sorted(self._slowest, reverse=True),
+        )
+
+    def reset(self) -> Snapshot:
+        """
+        Histograms are cleared in place, the patched Handle._run keeps a reference on them.
+        """
+        snapshot = self.snapshot()
+        self.callbacks.clear()
+        self.lag.clear()
+        self._slowest = []
+        self._slow_threshold = 0.0
+        return snapshot
+
+    async def export(self, interval: float, sink: Callable[[Snapshot], Any]) -> None:
+        """
+        Every `interval`, hand the snapshot of the interval to `sink` and start a new one.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            sink(self.reset())
@@ -7,6 +7,9 @@ import logging
 import time
 from contextlib import suppress
 
+from async_py.keyed_lock.lock import KeyedLock, KeyLock
+from async_py.rw_lock.lock import FairLock, LockRegistry
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
@@ -18,7 +21,7 @@ async def canary() -> None:
 
 
 class Locked:
-    def __init__(self, name: str, lock: asyncio.Lock | None = None) -> None:
+    def __init__(self, name: str, lock: asyncio.Lock | KeyLock | FairLock | None = None) -> None:
         self._lock = lock or asyncio.Lock()
         self._name = name
 
@@ -53,10 +56,24 @@ async def multi_lock() -> None:
 
 
 async def shared_lock() -> None:
-    lock = asyncio.Lock()
-    locked1 = Locked("first", lock)
-    locked2 = Locked("second", lock)
-    locked3 = Locked("third", lock)
+    """
+    The three share a FairLock: the report shows each waiting behind the others for most of its time.
+    """
+    lock = FairLock("shared_lock", registry=LockRegistry())
+    tasks = [
+        asyncio.create_task(Locked(name, lock).say_hello(sleep_time), name=f"{name} {sleep_time}")
+        for name in ["first", "second", "third"]
+        for sleep_time in [0.3, 0.2, 0.1]
+    ]
+    await asyncio.gather(*tasks)
+    logger.debug(lock.stats.summary())
+
+
+async def keyed_lock() -> None:
+    locks = KeyedLock()
+    locked1 = Locked("first", locks("first"))
+    locked2 = Locked("second", locks("second"))
+    locked3 = Locked("third", locks("third"))
     tasks = [
         locked1.say_hello(0.3),
         locked1.say_hello(0.2),
@@ -69,6 +86,7 @@ async def shared_lock() -> None:
         locked3.say_hello(0.1),
     ]
     await asyncio.gather(*tasks)
+    logger.debug(f"{len(locks)} locks left in the registry")
 
 
 async def main() -> None:
@@ -76,6 +94,8 @@ async def main() -> None:
     await multi_lock()
     logger.debug("---")
     await shared_lock()
+    logger.debug("---")
+    await keyed_lock()
     with suppress(asyncio.CancelledError):
         task.cancel()
 
@@ -1,20 +1,26 @@
 """
 A task nursery, the ancestor of asyncio.TaskGroup used to create, delete tasks and catch exceptions
+
+The benchmark runs JOBS short jobs, one task each in a Nursery or a TaskGroup, or on the workers of a WorkerNursery.
 """
 
 import asyncio
 import logging
-from asyncio import CancelledError, Task
-from collections.abc import Coroutine
+import time
+import tracemalloc
+from collections.abc import Callable, Coroutine
+from functools import partial
 from typing import Any
 
-from tenacity import RetryCallState, retry
-from tenacity.retry import retry_if_exception_type
-from tenacity.stop import stop_after_attempt
+from async_py.nursery.nursery import Nursery, WorkerNursery
+from async_py.retry.retry import retry
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
+JOBS = 100_000
+WORKERS = 10
+
 
 class CustomError(Exception):
     """Custom error"""
@@ -25,16 +31,7 @@ async def sleep_talking(msg: str, number: int | None = None, *, is_true: bool =
     logger.debug(msg, number, is_true)
 
 
-def after_print(state: RetryCallState) -> None:
-    logger.debug(f"Failed {state.attempt_number} time(s)")
-
-
-@retry(
-    stop=stop_after_attempt(3),
-    retry=retry_if_exception_type(CustomError),
-    after=after_print,
-    reraise=True,
-)
+@retry(attempts=3, retry_on=CustomError, base=0.05)
 async def raise_custom() -> None:
     await asyncio.sleep(0.1)
     raise CustomError("This is a custom error")
@@ -44,35 +41,6 @@ async def raise_another_error() -> None:
     raise ValueError("Not good!")
 
 
-class Nursery:
-    def __init__(self, silenced_errors: Exception | tuple[Any, ...] | None = None) -> None:
-        super().__init__()
-        self.tasks: set[Task[None]] = set()
-        self.silenced_errors: Exception | tuple[Any, ...] = silenced_errors or ()
-
-    def create_task(self, coroutine: Coroutine[Any, Any, None]) -> None:
-        task = asyncio.create_task(coroutine)
-        task.add_done_callback(self.done_callback)
-        self.tasks.add(task)
-
-    def done_callback(self, task: Task[None]) -> None:
-        try:
-            task.result()
-        except CancelledError:
-            logger.debug("Silencing a CancelledError.")
-        except self.silenced_errors:
-            logger.debug("Silencing a CustomError.")
-        except Exception:
-            logger.debug("Raising this one:")
-            raise
-        finally:
-            self.tasks.discard(task)
-
-    def cleanup_tasks(self) -> None:
-        for task in self.tasks:
-            task.cancel()
-
-
 async def main() -> None:
     nursery = Nursery(CustomError)  # or Nursery((CustomError, ValueError))
     nursery.create_task(sleep_talking("Hello", 10, is_true=True))  # will be ok
@@ -90,8 +58,77 @@ async def main() -> None:
     nursery.create_task(raise_another_error())  # will be raised immediately as no sleep
 
 
+async def bounded() -> None:
+    nursery = Nursery(CustomError, limit=2)
+    for i in range(6):
+        nursery.create_task(sleep_talking("Bounded %s, urgent: %s", i, is_true=i == 5), priority=0 if i == 5 else 1)
+    while nursery.running or nursery.queued:
+        logger.info(f"running: {nursery.running}, queued: {nursery.queued}, completed: {nursery.completed}")
+        await asyncio.sleep(0.1)
+    logger.info(f"completed: {nursery.completed}, silenced: {nursery.silenced}, raised: {nursery.raised}")
+
+
+async def workers() -> None:
+    nursery = WorkerNursery(CustomError, workers=2)
+    nursery.create_task(partial(sleep_talking, "Worker %s, ok: %s", 1, is_true=True))  # will be ok
+    nursery.create_task(raise_custom)  # will be silenced as CustomError
+    nursery.create_task(raise_another_error)  # will be raised to the loop exception handler
+    nursery.create_task(partial(sleep_talking, "Worker %s, ok: %s", 2, is_true=True))  # will be ok
+    await asyncio.sleep(0.5)
+    nursery.create_task(partial(sleep_talking, "Never %s, ok: %s", 3))  # will be silenced as CancelledError
+    await asyncio.sleep(0)
+    nursery.cleanup_tasks()
+    await asyncio.sleep(0)
+    logger.info(f"completed: {nursery.completed}, silenced: {nursery.silenced}, raised: {nursery.raised}")
+
+
+async def job() -> None:
+    pass
+
+
+async def run_nursery() -> None:
+    nursery = Nursery()
+    for _ in range(JOBS):
+        nursery.create_task(job())
+    await asyncio.wait(list(nursery.tasks))
+
+
+async def run_task_group() -> None:
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(JOBS):
+            tg.create_task(job())
+
+
+async def run_workers() -> None:
+    nursery = WorkerNursery(workers=WORKERS)
+    for _ in range(JOBS):
+        nursery.create_task(job)
+    await nursery.join()
+
+
+def benchmark() -> None:
+    runs: list[tuple[str, Callable[[], Coroutine[Any, Any, None]]]] = [
+        ("Nursery", run_nursery),
+        ("TaskGroup", run_task_group),
+        (f"WorkerNursery({WORKERS})", run_workers),
+    ]
+    for name, run in runs:
+        start_time = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - start_time
+
+        tracemalloc.start()
+        asyncio.run(run())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        logger.info(f"{name:>17}: {JOBS / elapsed:8.0f} jobs/s, {peak / JOBS:5.0f} bytes per job at the peak")
+
+
 if __name__ == "__main__":
     logger.info("=" * 80)
     logger.info(f"Running {__file__}")
     logger.info("=" * 80)
+    asyncio.run(bounded())
     asyncio.run(main())
+    asyncio.run(workers())
+    benchmark()
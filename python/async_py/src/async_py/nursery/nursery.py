@@ -0,0 +1,182 @@
+"""
+The Nursery keeps a reference on its tasks, silences the errors it is told to and cancels them all on cleanup.
+
+With a `limit`, at most `limit` tasks run at once: the coroutines submitted above it wait in a queue
+and are started as running tasks finish, lowest `priority` first then in submission order.
+
+The WorkerNursery runs jobs on `workers` long-lived tasks instead of one task per coroutine:
+a job is a callable, a coroutine function or a plain function, called and awaited inline by a worker.
+No Task, no done callback and no context copy per job, which for short jobs cost more than the job itself.
+The errors are sorted as in the Nursery, those not silenced go to the loop exception handler.
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+from asyncio import CancelledError, Task
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class Nursery:
+    def __init__(
+        self,
+        silenced_errors: type[BaseException] | tuple[type[BaseException], ...] | None = None,
+        limit: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.tasks: set[Task[None]] = set()
+        self.silenced_errors: type[BaseException] | tuple[type[BaseException], ...] = silenced_errors or ()
+        self.limit = limit
+        self.completed = 0
+        self.silenced = 0
+        self.raised = 0
+        self._queue: list[tuple[int, int, Coroutine[Any, Any, None]]] = []
+        self._counter = itertools.count()
+
+    @property
+    def running(self) -> int:
+        return len(self.tasks)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def create_task(self, coroutine: Coroutine[Any, Any, None], priority: int = 0) -> None:
+        if self.limit is None or len(self.tasks) < self.limit:
+            self._start(coroutine)
+        else:
+            heapq.heappush(self._queue, (priority, next(self._counter), coroutine))
+
+    def _start(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coroutine)
+        task.add_done_callback(self.done_callback)
+        self.tasks.add(task)
+
+    def done_callback(self, task: Task[None]) -> None:
+        try:
+            task.result()
+            self.completed += 1
+        except CancelledError:
+            self.silenced += 1
+            logger.debug("Silencing a CancelledError.")
+        except self.silenced_errors:
+            self.silenced += 1
+            logger.debug("Silencing a CustomError.")
+        except Exception:
+            self.raised += 1
+            logger.debug("Raising this one:")
+            raise
+        finally:
+            self.tasks.discard(task)
+            if self._queue:
+                self._start(heapq.heappop(self._queue)[2])
+
+    def cleanup_tasks(self) -> None:
+        """
+        Queued coroutines are dropped first, or cancelling the running tasks would start them.
+        """
+        for _, _, coroutine in self._queue:
+            coroutine.close()
+            self.silenced += 1
+        self._queue.clear()
+        for task in self.tasks:
+            task.cancel()
+
+
+Job = Callable[[], Awaitable[None] | None]
+
+
+class WorkerNursery:
+    def __init__(
+        self,
+        silenced_errors: type[BaseException] | tuple[type[BaseException], ...] | None = None,
+        workers: int = 10,
+    ) -> None:
+        self.workers: set[Task[None]] = set()
+        self.silenced_errors: type[BaseException] | tuple[type[BaseException], ...] = silenced_errors or ()
+        self.size = workers
+        self.running = 0
+        self.completed = 0
+        self.silenced = 0
+        self.raised = 0
+        self._jobs: deque[Job] = deque()
+        self._idle: deque[asyncio.Future[None]] = deque()
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+    @property
+    def queued(self) -> int:
+        return len(self._jobs)
+
+    def create_task(self, job: Job) -> None:
+        """
+        Workers are started on demand, up to `workers`, and wait for jobs once started.
+        """
+        self._jobs.append(job)
+        self._drained.clear()
+        while self._idle:
+            waiter = self._idle.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        if len(self.workers) < self.size:
+            worker = asyncio.create_task(self._work())
+            worker.add_done_callback(self.workers.discard)
+            self.workers.add(worker)
+
+    async def _work(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self._jobs:
+                waiter = loop.create_future()
+                self._idle.append(waiter)
+                await waiter
+            job = self._jobs.popleft()
+            self.running += 1
+            try:
+                result = job()
+                if inspect.isawaitable(result):
+                    await result
+                self.completed += 1
+            except CancelledError:
+                self.silenced += 1
+                logger.debug("Silencing a CancelledError.")
+                if asyncio.current_task().cancelling():  # type: ignore[union-attr]
+                    raise
+            except self.silenced_errors:
+                self.silenced += 1
+                logger.debug("Silencing a CustomError.")
+            except Exception as error:  # noqa: BLE001 # handed over to the loop exception handler
+                self.raised += 1
+                logger.debug("Raising this one:")
+                loop.call_exception_handler({"message": f"Exception in job {job!r}", "exception": error})
+            finally:
+                self.running -= 1
+                if not self.running and not self._jobs:
+                    self._drained.set()
+
+    async def join(self) -> None:
+        """
+        Waits until no job is queued or running.
+        """
+        await self._drained.wait()
+
+    def cleanup_tasks(self) -> None:
+        """
+        Queued jobs are dropped, the running ones cancelled with their worker.
+        """
+        self.silenced += len(self._jobs)
+        self._jobs.clear()
+        self._idle.clear()
+        for worker in self.workers:
+            worker.cancel()
+        self.workers.clear()  # jobs created from now on start new workers
+        # The running jobs set it when they end, a worker woken for a dropped job would not.
+        if not self.running:
+            self._drained.set()
@@ -0,0 +1,117 @@
+"""
+CPU bound jobs next to a task that should run every 10ms.
+
+On the loop thread the jobs starve the heartbeat until they are all done, whatever the number of cores.
+In a thread pool they share the GIL with the loop, in a process pool they run on other cores.
+Then a TaskGroup and a Nursery are cancelled with jobs still pending and running in a process pool.
+"""
+
+import asyncio
+import logging
+import time
+
+from async_py.nursery.nursery import Nursery
+from async_py.offload.pool import OffloadPool, cancelled
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+JOBS = 4
+LIMIT = 150_000
+HEARTBEAT = 0.01
+
+
+def count_primes(limit: int) -> int:
+    """
+    Returns early, with what it counted so far, if its pool is cancelled.
+    """
+    count = 0
+    for number in range(2, limit):
+        if not number % 10_000 and cancelled():
+            break
+        if all(number % divisor for divisor in range(2, int(number**0.5) + 1)):
+            count += 1
+    return count
+
+
+def fail_after(seconds: float) -> None:
+    time.sleep(seconds)
+    raise ValueError("Not good!")
+
+
+async def heartbeat(lags: list[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + HEARTBEAT
+        await asyncio.sleep(HEARTBEAT)
+        lags.append(loop.time() - expected)
+
+
+async def on_loop(limit: int) -> int:
+    return count_primes(limit)
+
+
+async def measure(name: str, pool: OffloadPool | None) -> None:
+    lags: list[float] = []
+    beating = asyncio.create_task(heartbeat(lags))
+    await asyncio.sleep(HEARTBEAT)
+    start_time = time.perf_counter()
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(JOBS):
+            tg.create_task(pool.run(count_primes, LIMIT) if pool is not None else on_loop(LIMIT))
+    elapsed = time.perf_counter() - start_time
+    await asyncio.sleep(HEARTBEAT)
+    beating.cancel()
+    logger.info(f"{name:>12}: {elapsed:.2f}s, {len(lags)} heartbeats, max lag {max(lags, default=0) * 1000:.0f}ms")
+
+
+async def cancel_task_group() -> None:
+    start_time = time.perf_counter()
+    async with OffloadPool(2) as pool:
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(pool.run(fail_after, 0.2))
+                for _ in range(JOBS):
+                    tg.create_task(pool.run(count_primes, LIMIT * 10))
+        except* ValueError as group:
+            logger.info(f"TaskGroup raised {group.exceptions!r}")
+    logger.info(
+        f"TaskGroup done in {time.perf_counter() - start_time:.2f}s: "
+        f"{pool.cancelled_jobs} pending jobs cancelled, {pool.interrupted_jobs} running jobs signalled"
+    )
+
+
+async def count_primes_job(pool: OffloadPool) -> None:
+    logger.debug(f"Counted {await pool.run(count_primes, LIMIT * 10)} primes")
+
+
+async def cancel_nursery() -> None:
+    start_time = time.perf_counter()
+    nursery = Nursery()
+    async with OffloadPool(2) as pool:
+        for _ in range(JOBS):
+            nursery.create_task(count_primes_job(pool))
+        await asyncio.sleep(0.2)
+        nursery.cleanup_tasks()
+        await asyncio.sleep(0)
+    logger.info(
+        f"Nursery done in {time.perf_counter() - start_time:.2f}s: silenced {nursery.silenced}, "
+        f"{pool.cancelled_jobs} pending jobs cancelled, {pool.interrupted_jobs} running jobs signalled"
+    )
+
+
+async def main() -> None:
+    await measure("loop thread", None)
+    async with OffloadPool(JOBS, processes=False) as pool:
+        await measure("thread pool", pool)
+    async with OffloadPool(JOBS) as pool:
+        await measure("process pool", pool)
+    await cancel_task_group()
+    await cancel_nursery()
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
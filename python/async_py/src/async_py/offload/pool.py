@@ -0,0 +1,100 @@
+"""
+Run CPU bound functions in a process or thread pool from the tasks of a TaskGroup or a Nursery.
+
+`await pool.run(func, *args)` returns the result or raises the error of func, so errors reach the TaskGroup
+and end up in its ExceptionGroup like those of any other task. Exceptions must be picklable in a process pool.
+
+A pool job can not be interrupted, only cancelled before it starts. When a task awaiting a job is cancelled:
+- the job is cancelled if it has not started yet
+- otherwise the pool is cancelled: its pending jobs are cancelled and its running jobs are signalled,
+  they see `cancelled()` become True and are expected to return early.
+
+So a pool is scoped to a group of tasks cancelled together, as the tasks of a TaskGroup or a Nursery.
+Used as an async context manager, it waits for its running jobs on exit, no job outlives the block:
+
+    async with OffloadPool() as pool, asyncio.TaskGroup() as tg:
+        tg.create_task(pool.run(count_primes, 1_000_000))
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Protocol
+
+_worker = threading.local()
+
+
+class Event(Protocol):
+    def set(self) -> None: ...
+
+    def is_set(self) -> bool: ...
+
+
+def _init_worker(event: Event) -> None:
+    _worker.cancelled = event
+
+
+def cancelled() -> bool:
+    """
+    To call from the jobs: True once their pool is cancelled, always False outside of a pool.
+    """
+    event: Event | None = getattr(_worker, "cancelled", None)
+    return event is not None and event.is_set()
+
+
+class OffloadPool:
+    def __init__(self, max_workers: int | None = None, *, processes: bool = True) -> None:
+        self.cancelled_jobs = 0
+        self.interrupted_jobs = 0
+        self._futures: set[Future[Any]] = set()
+        self._event: Event
+        self.executor: Executor
+        if processes:
+            self._event = multiprocessing.Event()
+            self.executor = ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(self._event,))
+        else:
+            self._event = threading.Event()
+            self.executor = ThreadPoolExecutor(max_workers, initializer=_init_worker, initargs=(self._event,))
+
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """
+        Signals the running jobs and cancels the pending ones, their tasks get a CancelledError.
+        """
+        self._event.set()
+        for future in list(self._futures):
+            future.cancel()
+
+    async def run[T](self, func: Callable[..., T], *args: Any) -> T:
+        if self.cancelled():
+            raise asyncio.CancelledError
+        future = self.executor.submit(func, *args)
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if future.cancel():
+                self.cancelled_jobs += 1
+            else:
+                self.interrupted_jobs += 1
+                self.cancel()
+            raise
+
+    async def __aenter__(self) -> "OffloadPool":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is not None:
+            self.cancel()
+        await asyncio.to_thread(self.executor.shutdown, wait=True, cancel_futures=exc_type is not None)
@@ -0,0 +1,87 @@
+"""
+The async generator of signal_generator, slower, consumed one item at a time then through a Stream:
+prefetching the items, fetching 10 at once, filtering and batching them.
+Then a consumer cancelled halfway: every stage is closed, down to the generator cleanup.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import AsyncGenerator
+
+from async_py.pipeline.stream import Stream
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+ITEMS = 50
+READ_TIME = 0.01
+FETCH_TIME = 0.1
+
+
+async def slow_async_gen(items: int) -> AsyncGenerator[int]:
+    i = 0
+    try:
+        while i < items:
+            await asyncio.sleep(READ_TIME)
+            yield i
+            i += 1
+    finally:
+        logger.debug(f"Async generator cleanup after {i} items")
+
+
+async def fetch(value: int) -> int:
+    await asyncio.sleep(random.uniform(FETCH_TIME / 2, FETCH_TIME * 1.5))
+    return value * value
+
+
+def is_even(value: int) -> bool:
+    return value % 2 == 0
+
+
+async def serial() -> None:
+    start_time = time.perf_counter()
+    results = []
+    async for value in slow_async_gen(ITEMS):
+        result = await fetch(value)
+        if is_even(result):
+            results.append(result)
+    logger.info(f"Serial: {len(results)} results in {time.perf_counter() - start_time:.2f}s")
+
+
+async def pipeline(*, ordered: bool) -> None:
+    start_time = time.perf_counter()
+    stream = Stream(slow_async_gen(ITEMS)).prefetch(10).map(fetch, concurrency=10, ordered=ordered)
+    batches = await stream.filter(is_even).batch(8, max_wait=0.2).collect()
+    logger.info(
+        f"Pipeline {ordered=}: {sum(len(batch) for batch in batches)} results in {len(batches)} batches "
+        f"in {time.perf_counter() - start_time:.2f}s, first batch {batches[0]}"
+    )
+
+
+async def cancelled() -> None:
+    async def consume() -> None:
+        async with Stream(slow_async_gen(ITEMS)).prefetch(10).map(fetch, concurrency=10) as stream:
+            async for value in stream:
+                logger.debug(f"Consumed {value}")
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.3)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    logger.info(f"Consumer cancelled, {len(asyncio.all_tasks()) - 1} tasks left")
+
+
+async def main() -> None:
+    await serial()
+    await pipeline(ordered=True)
+    await pipeline(ordered=False)
+    await cancelled()
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
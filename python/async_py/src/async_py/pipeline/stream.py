@@ -0,0 +1,213 @@
+"""
+Streaming pipeline of async generators.
+
+signal_generator consumes its generator one item at a time: every await of the consumer adds up.
+A Stream chains stages that overlap instead:
+    async with Stream(urls()).prefetch(100).map(fetch, concurrency=10).filter(is_valid).batch(50, 0.5) as stream:
+        async for rows in stream:
+            await save(rows)
+- map runs up to `concurrency` calls at once, yielding the results in order, or as they complete with ordered=False
+- filter keeps the items for which a predicate, sync or async, is true
+- batch yields lists of up to `size` items, or what came within `max_wait` seconds of the first one
+- prefetch reads up to `size` items ahead in a task of its own
+
+Backpressure: no stage holds more than its own bound, a slow consumer stops the reads upstream.
+Cleanup: a stage closed or cancelled cancels its tasks and closes the stage before it with aclose(),
+down to the source, so the finally blocks of the generators run. `async with` closes the stream on exit.
+"""
+
+import asyncio
+import inspect
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Self
+
+
+@dataclass
+class _End:
+    error: Exception | None = None
+
+
+async def _aclose(iterator: AsyncIterator[Any]) -> None:
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+async def _cancel(tasks: Iterable[asyncio.Future[Any]]) -> None:
+    tasks = list(tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _iterate[T](source: Iterable[T]) -> AsyncIterator[T]:
+    for item in source:
+        yield item
+
+
+async def _map_ordered[T, U](
+    upstream: AsyncIterator[T], func: Callable[[T], Awaitable[U]], concurrency: int
+) -> AsyncIterator[U]:
+    pending: deque[asyncio.Future[U]] = deque()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    item = await anext(upstream)
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.append(asyncio.ensure_future(func(item)))
+            if not pending:
+                return
+            yield await pending.popleft()
+    finally:
+        await _cancel(pending)
+        await _aclose(upstream)
+
+
+async def _map_unordered[T, U](
+    upstream: AsyncIterator[T], func: Callable[[T], Awaitable[U]], concurrency: int
+) -> AsyncIterator[U]:
+    pending: set[asyncio.Future[U]] = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    item = await anext(upstream)
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.add(asyncio.ensure_future(func(item)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        await _cancel(pending)
+        await _aclose(upstream)
+
+
+async def _filter[T](upstream: AsyncIterator[T], predicate: Callable[[T], bool | Awaitable[bool]]) -> AsyncIterator[T]:
+    try:
+        async for item in upstream:
+            keep = predicate(item)
+            if inspect.isawaitable(keep):
+                keep = await keep
+            if keep:
+                yield item
+    finally:
+        await _aclose(upstream)
+
+
+async def _batch[T](upstream: AsyncIterator[T], size: int, max_wait: float | None) -> AsyncIterator[list[T]]:
+    loop = asyncio.get_running_loop()
+    # The read of the next item outlives a batch cut short by `max_wait`, it starts the next one.
+    next_item: asyncio.Future[T] | None = None
+    try:
+        while True:
+            batch: list[T] = []
+            deadline: float | None = None
+            while len(batch) < size:
+                if next_item is None:
+                    next_item = asyncio.ensure_future(anext(upstream))
+                remaining = None if deadline is None else max(deadline - loop.time(), 0)
+                done, _ = await asyncio.wait({next_item}, timeout=remaining)
+                if not done:
+                    break
+                try:
+                    batch.append(next_item.result())
+                except StopAsyncIteration:
+                    if batch:
+                        yield batch
+                    return
+                finally:
+                    next_item = None
+                if deadline is None and max_wait is not None:
+                    deadline = loop.time() + max_wait
+            yield batch
+    finally:
+        if next_item is not None:
+            await _cancel([next_item])
+        await _aclose(upstream)
+
+
+async def _prefetch[T](upstream: AsyncIterator[T], size: int) -> AsyncIterator[T]:
+    buffer: asyncio.Queue[T | _End] = asyncio.Queue(size)
+
+    async def read() -> None:
+        try:
+            async for item in upstream:
+                await buffer.put(item)
+        except Exception as error:  # noqa: BLE001
+            await buffer.put(_End(error))
+        else:
+            await buffer.put(_End())
+
+    reader = asyncio.create_task(read())
+    try:
+        while not isinstance(item := await buffer.get(), _End):
+            yield item
+        if item.error is not None:
+            raise item.error
+    finally:
+        await _cancel([reader])
+        await _aclose(upstream)
+
+
+class Stream[T]:
+    def __init__(self, source: AsyncIterable[T] | Iterable[T]) -> None:
+        self._iterator = aiter(source) if isinstance(source, AsyncIterable) else _iterate(source)
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> T:
+        return await anext(self._iterator)
+
+    async def aclose(self) -> None:
+        await _aclose(self._iterator)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    def map[U](self, func: Callable[[T], Awaitable[U]], concurrency: int = 1, *, ordered: bool = True) -> "Stream[U]":
+        if concurrency < 1:
+            msg = f"concurrency ({concurrency}) must be at least 1"
+            raise ValueError(msg)
+        if ordered:
+            return Stream(_map_ordered(self, func, concurrency))
+        return Stream(_map_unordered(self, func, concurrency))
+
+    def filter(self, predicate: Callable[[T], bool | Awaitable[bool]]) -> "Stream[T]":
+        return Stream(_filter(self, predicate))
+
+    def batch(self, size: int, max_wait: float | None = None) -> "Stream[list[T]]":
+        if size < 1:
+            msg = f"size ({size}) must be at least 1"
+            raise ValueError(msg)
+        return Stream(_batch(self, size, max_wait))
+
+    def prefetch(self, size: int) -> "Stream[T]":
+        if size < 1:
+            msg = f"size ({size}) must be at least 1"
+            raise ValueError(msg)
+        return Stream(_prefetch(self, size))
+
+    async def collect(self) -> list[T]:
+        async with self:
+            return [item async for item in self]
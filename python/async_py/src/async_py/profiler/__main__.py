@@ -0,0 +1,71 @@
+"""
+Profile a mix of CPU bound and sleeping tasks and compare the overhead with sys.settrace.
+"""
+
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from async_py.profiler.sampler import Profiler
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+
+def fibonacci(n: int) -> int:
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+async def crunch() -> None:
+    for _ in range(20):
+        fibonacci(24)
+        await asyncio.sleep(0)
+
+
+async def nap() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0.01)
+
+
+async def workload() -> float:
+    start_time = time.perf_counter()
+    async with asyncio.TaskGroup() as tg:
+        for i in range(3):
+            tg.create_task(crunch(), name=f"crunch-{i}")
+        tg.create_task(nap(), name="nap")
+    return time.perf_counter() - start_time
+
+
+def trace_calls(_frame: FrameType, _event: str, _arg: Any) -> None:
+    return None
+
+
+async def main() -> None:
+    baseline = await workload()
+
+    sys.settrace(trace_calls)  # type: ignore[arg-type]
+    traced = await workload()
+    sys.settrace(None)
+
+    async with Profiler() as profiler:
+        sampled = await workload()
+
+    logger.info(f"no profiler {baseline:.3f}s, sys.settrace {traced:.3f}s, sampling at 100Hz {sampled:.3f}s")
+    for name, times in sorted(profiler.task_times().items()):
+        logger.info(f"{name:>10}: wall {times.wall * 1000:.0f}ms, cpu {times.cpu * 1000:.0f}ms")
+
+    path = Path(tempfile.gettempdir()) / "async_py.collapsed"
+    profiler.write_collapsed(path)
+    logger.info(f"Collapsed stacks written to {path}, try: flamegraph.pl {path} > flamegraph.svg")
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+A sampling profiler for the event loop thread.
+
+sys.settrace runs a Python callback on every call of every function.
+Here a background thread looks at the loop thread every `interval` seconds instead:
+it reads its current stack with sys._current_frames() and the running task with asyncio.current_task(loop).
+The cost is one stack walk per sample, whatever the program does in between,
+so a low sample rate can stay on in production.
+
+Wall time since the previous sample and CPU time read from the loop thread's CPU clock
+are attributed to the stack seen at the sample.
+While the loop thread runs pure Python code, the sampler waits for the GIL:
+samples are then at least sys.getswitchinterval() (5ms) apart whatever the interval.
+Stacks are written in the collapsed format (`task;frame;frame count`) used by flamegraph.pl and speedscope.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType, TracebackType
+
+IDLE = "<idle>"
+MAX_DEPTH = 128
+
+
+@dataclass
+class TaskTimes:
+    wall: float = 0
+    cpu: float = 0
+
+
+class Profiler:
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self.wall_times: defaultdict[tuple[str, ...], float] = defaultdict(float)
+        self.cpu_times: defaultdict[tuple[str, ...], float] = defaultdict(float)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id = 0
+        self._cpu_clock: int | None = None
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        To call from the event loop thread.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        if hasattr(time, "pthread_getcpuclockid"):
+            self._cpu_clock = time.pthread_getcpuclockid(self._loop_thread_id)
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="Profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def __aenter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def _cpu_time(self) -> float:
+        return time.clock_gettime(self._cpu_clock) if self._cpu_clock is not None else 0
+
+    def _run(self) -> None:
+        last_wall, last_cpu = time.perf_counter(), self._cpu_time()
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._loop_thread_id)  # noqa: SLF001
+            if frame is None:
+                continue
+            task = asyncio.current_task(self._loop)
+            stack = (task.get_name() if task is not None else IDLE, *self._collapse(frame))
+            wall, cpu = time.perf_counter(), self._cpu_time()
+            self.samples[stack] += 1
+            self.wall_times[stack] += wall - last_wall
+            self.cpu_times[stack] += cpu - last_cpu
+            last_wall, last_cpu = wall, cpu
+
+    @staticmethod
+    def _collapse(frame: FrameType | None) -> list[str]:
+        stack: list[str] = []
+        while frame is not None and len(stack) < MAX_DEPTH:
+            code = frame.f_code
+            stack.append(f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}")
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def task_times(self) -> dict[str, TaskTimes]:
+        times: dict[str, TaskTimes] = {}
+        for stack, wall in list(self.wall_times.items()):
+            task_time = times.setdefault(stack[0], TaskTimes())
+            task_time.wall += wall
+            task_time.cpu += self.cpu_times[stack]
+        return times
+
+    def write_collapsed(self, path: Path, *, cpu: bool = False) -> None:
+        """
+        Weights are microseconds of wall time, or of CPU time.
+        """
+        times = self.cpu_times if cpu else self.wall_times
+        with path.open("w") as file:
+            for stack, seconds in list(times.items()):
+                if weight := round(seconds * 1_000_000):
+                    file.write(f"{';'.join(stack)} {weight}\n")
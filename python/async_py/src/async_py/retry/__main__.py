@@ -0,0 +1,81 @@
+"""
+Load a failing dependency receives from its callers' retries.
+
+Callers send RATE requests per second, whatever happens to the previous ones.
+The dependency fails 1% of the calls, and all of them during an outage in the middle of the run.
+Amplification is the calls the dependency receives per request, during the outage and overall.
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+from async_py.retry.retry import RetryBudget, retry
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+RATE = 10_000
+DURATION = 1.5
+OUTAGE = (0.5, 1.0)
+TICK = 0.01
+
+
+class DependencyError(Exception):
+    """The dependency failed"""
+
+
+class Dependency:
+    def __init__(self) -> None:
+        self.start_time = time.monotonic()
+        self.calls = 0
+        self.outage_calls = 0
+
+    async def call(self) -> None:
+        self.calls += 1
+        await asyncio.sleep(0.001)
+        if OUTAGE[0] <= time.monotonic() - self.start_time < OUTAGE[1]:
+            self.outage_calls += 1
+            raise DependencyError
+        if random.random() < 0.01:
+            raise DependencyError
+
+
+async def run(name: str, attempts: int, base: float, budget: RetryBudget | None) -> None:
+    dependency = Dependency()
+    call = retry(attempts=attempts, retry_on=DependencyError, base=base, budget=budget)(dependency.call)
+
+    tasks: set[asyncio.Task[None]] = set()
+    requests = outage_requests = 0
+    while (elapsed := time.monotonic() - dependency.start_time) < DURATION:
+        for _ in range(int(RATE * TICK)):
+            tasks.add(asyncio.create_task(call()))
+        requests += int(RATE * TICK)
+        if OUTAGE[0] <= elapsed < OUTAGE[1]:
+            outage_requests += int(RATE * TICK)
+        await asyncio.sleep(TICK)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    failed = sum(isinstance(result, DependencyError) for result in results)
+    stats = call.stats  # type: ignore[attr-defined]
+    logger.info(
+        f"{name:>16}: amplification {dependency.calls / requests:.2f} overall, "
+        f"{dependency.outage_calls / max(outage_requests, 1):.2f} during the outage, "
+        f"{failed / requests:.1%} failed, {stats.retries} retries, {stats.over_budget} over budget, "
+        f"{stats.waited / max(stats.retries, 1) * 1000:.1f}ms average backoff"
+    )
+
+
+async def main() -> None:
+    await run("no retry", attempts=1, base=0, budget=None)
+    await run("3 attempts", attempts=3, base=0, budget=None)
+    await run("3 with backoff", attempts=3, base=0.05, budget=None)
+    await run("3 with budget", attempts=3, base=0.05, budget=RetryBudget(ratio=0.1))
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
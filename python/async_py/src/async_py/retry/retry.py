@@ -0,0 +1,129 @@
+"""
+Retries with exponential backoff and full jitter, under a retry budget.
+
+Retrying at once, as soon as a dependency fails, multiplies its load by the number of attempts
+right when it can least take it. Here the n-th retry first sleeps a random time between 0 and `base * 2**(n-1)`,
+capped by `cap`: the retries of all callers spread out instead of coming back together.
+
+The budget bounds the retries of the whole process: a token bucket where every call deposits `ratio` token
+and every retry withdraws one, topped up by `min_per_second` so a quiet process can still retry.
+When the dependency is down, the retries stay under `ratio` of the calls, then the error is raised at once.
+It is also raised at once when the retry would start past the deadline of the caller,
+set by async_py.deadline.deadline.Deadline: nobody would wait for it.
+"""
+
+import asyncio
+import functools
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any
+
+from async_py.deadline.deadline import remaining
+
+logger = logging.getLogger(__name__)
+
+
+class RetryBudget:
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_per_second: float = 10,
+        max_tokens: float = 100,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.timer = timer
+        self.tokens = min_per_second
+        self._last = timer()
+
+    def deposit(self) -> None:
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        now = self.timer()
+        self.tokens = min(self.tokens + (now - self._last) * self.min_per_second, self.max_tokens)
+        self._last = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+DEFAULT_BUDGET = RetryBudget()
+
+
+@dataclass
+class RetryStats:
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    gave_up: int = 0
+    over_budget: int = 0
+    past_deadline: int = 0
+    waited: float = 0
+    elapsed: float = 0
+
+
+def backoff(attempt: int, base: float, cap: float) -> float:
+    """
+    Full jitter: anywhere between no wait and the exponential backoff of the attempt.
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def retry[**P, T](
+    attempts: int = 3,
+    retry_on: type[BaseException] | tuple[type[BaseException], ...] = Exception,
+    base: float = 0.1,
+    cap: float = 10,
+    budget: RetryBudget | None = DEFAULT_BUDGET,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Coroutine[Any, Any, T]]]:
+    """
+    Retries the coroutine function on `retry_on` errors, up to `attempts` calls in total.
+    Each decorated function counts its calls, attempts and time spent in `.stats`.
+    """
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Coroutine[Any, Any, T]]:
+        stats = RetryStats()
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            stats.calls += 1
+            if budget is not None:
+                budget.deposit()
+            start_time = time.perf_counter()
+            attempt = 1
+            try:
+                while True:
+                    stats.attempts += 1
+                    try:
+                        return await func(*args, **kwargs)
+                    except retry_on:
+                        logger.debug(f"{func.__qualname__} failed {attempt} time(s)")
+                        if attempt >= attempts:
+                            stats.gave_up += 1
+                            raise
+                        delay = backoff(attempt, base, cap)
+                        time_left = remaining()
+                        if time_left is not None and time_left <= delay:
+                            stats.past_deadline += 1
+                            raise
+                        if budget is not None and not budget.withdraw():
+                            stats.over_budget += 1
+                            raise
+                    stats.retries += 1
+                    stats.waited += delay
+                    await asyncio.sleep(delay)
+                    attempt += 1
+            finally:
+                stats.elapsed += time.perf_counter() - start_time
+
+        wrapper.stats = stats  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -0,0 +1,53 @@
+"""
+A read-mostly workload, 9 reads for 1 write, behind a FairLock then behind a RWLock,
+with the contention reported for each lock.
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+from async_py.rw_lock.lock import REGISTRY, FairLock, RWLock
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+TASKS = 20
+OPERATIONS = 10
+WRITE_RATIO = 0.1
+HOLD_TIME = 0.01
+
+
+async def fair_worker(lock: FairLock) -> None:
+    for _ in range(OPERATIONS):
+        async with lock:
+            await asyncio.sleep(HOLD_TIME)
+
+
+async def rw_worker(lock: RWLock) -> None:
+    for _ in range(OPERATIONS):
+        async with lock.write if random.random() < WRITE_RATIO else lock.read:
+            await asyncio.sleep(HOLD_TIME)
+
+
+async def main() -> None:
+    fair_lock = FairLock("fair")
+    start_time = time.perf_counter()
+    await asyncio.gather(*[asyncio.create_task(fair_worker(fair_lock), name=f"fair {i}") for i in range(TASKS)])
+    logger.info(f"FairLock: {TASKS * OPERATIONS} operations in {time.perf_counter() - start_time:.2f}s")
+
+    rw_lock = RWLock("rw")
+    start_time = time.perf_counter()
+    await asyncio.gather(*[asyncio.create_task(rw_worker(rw_lock), name=f"rw {i}") for i in range(TASKS)])
+    logger.info(f"RWLock: {TASKS * OPERATIONS} operations in {time.perf_counter() - start_time:.2f}s")
+
+    for line in REGISTRY.report():
+        logger.info(line)
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
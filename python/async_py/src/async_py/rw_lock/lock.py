@@ -0,0 +1,298 @@
+"""
+A fair FIFO lock and a reader-writer lock, both reporting their contention.
+
+asyncio.Lock lets a coroutine arriving while the lock is being handed over take it before the waiters,
+and serializes readers as it does writers. Here:
+- FairLock hands the lock over to the first waiter on release, strictly in arrival order
+- RWLock lets any number of readers in at once, and only one writer. Writers have the preference:
+  once a writer waits, new readers wait behind it, and a released write lock goes to the next writer first.
+
+Every lock records in LockStats, per lock name (RWLock has one for its readers and one for its writers):
+how long it was waited for and held, in total and as histograms, the longest queue
+and the coroutine that held it the longest.
+Locks with the same name share their stats in a LockRegistry, REGISTRY by default.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any
+
+from async_py.loop_monitor.monitor import Histogram, Percentiles
+
+
+def _holder() -> str:
+    task = asyncio.current_task()
+    if task is None:
+        return "no task"
+    coroutine = task.get_coro()
+    return f"{task.get_name()} ({getattr(coroutine, '__qualname__', coroutine)})"
+
+
+@dataclass
+class LockStats:
+    name: str
+    waits: Histogram = field(default_factory=Histogram)
+    holds: Histogram = field(default_factory=Histogram)
+    waited: float = 0.0
+    held: float = 0.0
+    max_queue: int = 0
+    longest_hold: float = 0.0
+    longest_holder: str | None = None
+
+    @property
+    def acquisitions(self) -> int:
+        return self.waits.count
+
+    def record_wait(self, seconds: float) -> None:
+        self.waits.add(seconds)
+        self.waited += seconds
+
+    def record_hold(self, seconds: float, holder: str) -> None:
+        self.holds.add(seconds)
+        self.held += seconds
+        if seconds > self.longest_hold:
+            self.longest_hold = seconds
+            self.longest_holder = holder
+
+    def summary(self) -> str:
+        waits = Percentiles.from_histogram(self.waits)
+        holds = Percentiles.from_histogram(self.holds)
+        return (
+            f"{self.name}: {self.acquisitions} acquisitions, waited {self.waited:.3f}s, held {self.held:.3f}s, "
+            f"wait p50 {waits.p50 * 1000:.3f}ms p99 {waits.p99 * 1000:.3f}ms max {waits.max * 1000:.3f}ms, "
+            f"hold p50 {holds.p50 * 1000:.3f}ms p99 {holds.p99 * 1000:.3f}ms max {holds.max * 1000:.3f}ms, "
+            f"max queue {self.max_queue}, longest held by {self.longest_holder}"
+        )
+
+
+class LockRegistry:
+    def __init__(self) -> None:
+        self._stats: dict[str, LockStats] = {}
+
+    def __call__(self, name: str) -> LockStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = LockStats(name)
+        return stats
+
+    def __iter__(self) -> Iterator[LockStats]:
+        return iter(self._stats.values())
+
+    def clear(self) -> None:
+        self._stats.clear()
+
+    def report(self) -> list[str]:
+        return [stats.summary() for stats in self._stats.values()]
+
+
+REGISTRY = LockRegistry()
+
+
+class _Waiters:
+    """
+    FIFO of futures woken one at a time. Cancelled waiters are left in place and skipped on wake up.
+    """
+
+    def __init__(self, stats: LockStats) -> None:
+        self._stats = stats
+        self._futures: deque[asyncio.Future[None]] = deque()
+        self.queued = 0
+
+    def __bool__(self) -> bool:
+        return self.queued > 0
+
+    async def wait(self, on_handed_over_cancel: Callable[[], None]) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._futures.append(future)
+        self.queued += 1
+        self._stats.max_queue = max(self._stats.max_queue, self.queued)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                self.queued -= 1
+            else:
+                # Cancelled after being handed the lock, pass it on.
+                on_handed_over_cancel()
+            raise
+
+    def wake_one(self) -> bool:
+        while self._futures:
+            future = self._futures.popleft()
+            if not future.done():
+                self.queued -= 1
+                future.set_result(None)
+                return True
+        return False
+
+    def wake_all(self) -> int:
+        woken = 0
+        while self.wake_one():
+            woken += 1
+        return woken
+
+
+class FairLock:
+    def __init__(self, name: str = "lock", registry: LockRegistry = REGISTRY) -> None:
+        self.name = name
+        self.stats = registry(name)
+        self._waiters = _Waiters(self.stats)
+        self._locked = False
+        self._holder: str | None = None
+        self._acquired_at = 0.0
+
+    def locked(self) -> bool:
+        return self._locked
+
+    @property
+    def queue_length(self) -> int:
+        return self._waiters.queued
+
+    async def acquire(self) -> bool:
+        start_time = time.perf_counter()
+        if self._locked or self._waiters:
+            await self._waiters.wait(self._hand_over)
+        self._locked = True
+        self._acquired_at = time.perf_counter()
+        self._holder = _holder()
+        self.stats.record_wait(self._acquired_at - start_time)
+        return True
+
+    def release(self) -> None:
+        if not self._locked:
+            raise RuntimeError("Lock is not acquired.")
+        self.stats.record_hold(time.perf_counter() - self._acquired_at, self._holder or "")
+        self._hand_over()
+
+    def _hand_over(self) -> None:
+        # The lock stays locked when handed over: nobody can take it between the release and the wake up.
+        if not self._waiters.wake_one():
+            self._locked = False
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
+
+
+class _LockSide:
+    """
+    One side of a RWLock, usable wherever an asyncio.Lock is used with `async with`.
+    """
+
+    def __init__(
+        self,
+        stats: LockStats,
+        acquire: Callable[[], Awaitable[bool]],
+        release: Callable[[], None],
+        locked: Callable[[], bool],
+    ) -> None:
+        self.stats = stats
+        self.acquire = acquire
+        self.release = release
+        self.locked = locked
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
+
+
+class RWLock:
+    """
+    `async with lock.read:` for the readers, `async with lock.write:` for the writers.
+    """
+
+    def __init__(self, name: str = "rw_lock", registry: LockRegistry = REGISTRY) -> None:
+        self.name = name
+        self.read = _LockSide(registry(f"{name} read"), self.acquire_read, self.release_read, self.write_locked)
+        self.write = _LockSide(registry(f"{name} write"), self.acquire_write, self.release_write, self.locked)
+        self._read_waiters = _Waiters(self.read.stats)
+        self._write_waiters = _Waiters(self.write.stats)
+        self._readers: dict[asyncio.Task[Any] | None, list[tuple[float, str]]] = {}
+        self._reading = 0
+        self._writing = False
+        self._writer = (0.0, "")
+
+    def locked(self) -> bool:
+        return self._writing or self._reading > 0
+
+    def write_locked(self) -> bool:
+        return self._writing
+
+    @property
+    def queue_length(self) -> int:
+        return self._read_waiters.queued + self._write_waiters.queued
+
+    async def acquire_read(self) -> bool:
+        start_time = time.perf_counter()
+        if self._writing or self._write_waiters:
+            await self._read_waiters.wait(self._release_reader)
+        else:
+            self._reading += 1
+        now = time.perf_counter()
+        self._readers.setdefault(asyncio.current_task(), []).append((now, _holder()))
+        self.read.stats.record_wait(now - start_time)
+        return True
+
+    def release_read(self) -> None:
+        task = asyncio.current_task()
+        holds = self._readers.get(task)
+        if not holds:
+            raise RuntimeError("Read lock is not acquired by this task.")
+        acquired_at, holder = holds.pop()
+        if not holds:
+            del self._readers[task]
+        self.read.stats.record_hold(time.perf_counter() - acquired_at, holder)
+        self._release_reader()
+
+    async def acquire_write(self) -> bool:
+        start_time = time.perf_counter()
+        if self._writing or self._reading or self._write_waiters:
+            await self._write_waiters.wait(self._release_writer)
+        else:
+            self._writing = True
+        now = time.perf_counter()
+        self._writer = (now, _holder())
+        self.write.stats.record_wait(now - start_time)
+        return True
+
+    def release_write(self) -> None:
+        if not self._writing:
+            raise RuntimeError("Write lock is not acquired.")
+        acquired_at, holder = self._writer
+        self.write.stats.record_hold(time.perf_counter() - acquired_at, holder)
+        self._release_writer()
+
+    def _release_reader(self) -> None:
+        self._reading -= 1
+        self._hand_over()
+
+    def _release_writer(self) -> None:
+        self._writing = False
+        self._hand_over()
+
+    def _hand_over(self) -> None:
+        # Handed over locks are counted before the wake up: nobody can take them in between.
+        if self._writing or self._reading:
+            return
+        if self._write_waiters.wake_one():
+            self._writing = True
+            return
+        self._reading += self._read_waiters.wake_all()
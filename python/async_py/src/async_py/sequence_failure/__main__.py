@@ -14,73 +14,254 @@ https://docs.python.org/3.10/library/asyncio-future.html#asyncio.Future.add_done
 
 which call loop.call_soon() which maintains FIFO ordering.
 https://docs.python.org/3.10/library/asyncio-eventloop.html#asyncio.loop.call_soon
+
+It doubles as a benchmark of the event loop: every parameter is a command line option
+and the run reports items/s, queue depth and RSS over time and ordering violations, as CSV or JSON.
+    python -m async_py.sequence_failure --producers 10000 --duration 5 --format json
+With `--queue batch` the consumer takes up to `--batch-size` items per await from a BatchQueue.
+With `--queue bounded` the queue pushes back on the producers once `--maxsize` items or `--maxbytes` are queued,
+according to `--policy` and the watermarks, and the report includes how long the producers waited.
+Blocked producers do show up as ordering violations: a producer that waited puts its value after the others
+already put their next one. Admission is FIFO though, so far fewer than with a bounded asyncio.Queue.
+With `--timer wheel` the producers sleep on a shared TimerWheel instead of one loop timer each,
+with `--timer ticker` they all wait for the ticks of a single Ticker.
 """
 
+import argparse
 import asyncio
+import csv
+import dataclasses
+import json
 import logging
+import os
+import resource
+import sys
 import time
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from functools import partial
+
+from async_py.backpressure.queue import BoundedQueue, Policy
+from async_py.batch_queue.queue import BatchQueue
+from async_py.event_loop.loop import available_loops, loop_factory
+from async_py.loop_monitor.monitor import Percentiles
+from async_py.ticker.wheel import Ticker, TimerWheel
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
 SLEEP_TIME = 1
-done_event = asyncio.Event()
 
 
-async def count(queue: asyncio.Queue[int]) -> None:
+@dataclass
+class Config:
+    producers: int = 100_000
+    sleep_time: float = SLEEP_TIME
+    maxsize: int = 0
+    maxbytes: int = 0
+    policy: Policy = Policy.BLOCK
+    high_watermark: float | None = None
+    low_watermark: float | None = None
+    loop: str = "auto"
+    queue: str = "asyncio"
+    timer: str = "sleep"
+    batch_size: int = 1
+    duration: float = 10
+    sample_interval: float = 1
+    output_format: str = "csv"
+
+
+@dataclass
+class Sample:
+    elapsed: float
+    items: int
+    items_per_second: float
+    depth: int
+    rss: int
+    violations: int
+
+
+@dataclass
+class Report:
+    config: Config
+    items: int = 0
+    violations: int = 0
+    elapsed: float = 0
+    items_per_second: float = 0
+    max_depth: int = 0
+    max_rss: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    producer_wait: Percentiles | None = None
+    samples: list[Sample] = field(default_factory=list)
+
+
+def current_rss() -> int:
+    """
+    Resident memory in bytes, from /proc on Linux, the peak from getrusage elsewhere.
+    """
+    try:
+        with open("/proc/self/statm") as statm:  # noqa: PTH123
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+Queue = asyncio.Queue[int] | BatchQueue[int] | BoundedQueue[int]
+
+
+async def count(queue: Queue, wait: Callable[[], Awaitable[object]]) -> None:
     i = 0
-    while not done_event.is_set():
-        await queue.put(i)
+    while True:
+        with suppress(asyncio.QueueFull):  # Rejected, counted by the queue
+            await queue.put(i)
         i += 1
-        await asyncio.sleep(SLEEP_TIME)
+        await wait()
+
+
+async def get_batch(queue: Queue, batch_size: int) -> list[int]:
+    if isinstance(queue, BatchQueue):
+        return await queue.get_many(batch_size)
+    batch = [await queue.get()]
+    while len(batch) < batch_size and not queue.empty():
+        batch.append(queue.get_nowait())
+    return batch
 
 
-async def queue_consumer(queue: asyncio.Queue[int]) -> None:
+async def queue_consumer(queue: Queue, batch_size: int, report: Report) -> None:
     """
     Consumes from the queue and checks if values maintain their ordering.
+    Up to `batch_size` items are taken for each await.
     """
     last_i = 0
-    iterations = 0
 
-    while not done_event.is_set():
-        i = await queue.get()
-        if iterations % 10_000 == 0:
-            logging.info(f"Processed {iterations} values. {i=}. Queue size: {queue.qsize()}")
-        if i < last_i:
-            logging.error(f"Order violation detected: {last_i} -> {i}")
-            done_event.set()
-        last_i = i
-        iterations += 1
+    while True:
+        batch = await get_batch(queue, batch_size)
+        for i in batch:
+            if i < last_i:
+                logger.error(f"Order violation detected: {last_i} -> {i}")
+                report.violations += 1
+            last_i = i
+        report.items += len(batch)
+
+
+async def sampler(queue: Queue, report: Report, start_time: float) -> None:
+    last_items, last_time = 0, start_time
+    while True:
+        await asyncio.sleep(report.config.sample_interval)
+        now = time.perf_counter()
+        sample = Sample(
+            elapsed=now - start_time,
+            items=report.items,
+            items_per_second=(report.items - last_items) / (now - last_time),
+            depth=queue.qsize(),
+            rss=current_rss(),
+            violations=report.violations,
+        )
+        report.samples.append(sample)
+        logger.info(f"Processed {sample.items} values. Queue size: {sample.depth}. {sample.items_per_second:.0f}/s")
+        last_items, last_time = report.items, now
+
+
+def make_queue(config: Config) -> Queue:
+    if config.queue == "batch":
+        return BatchQueue(config.maxsize)
+    if config.queue == "bounded":
+        return BoundedQueue(
+            maxsize=config.maxsize,
+            maxbytes=config.maxbytes,
+            policy=config.policy,
+            high_watermark=config.high_watermark,
+            low_watermark=config.low_watermark,
+        )
+    return asyncio.Queue(config.maxsize)
+
+
+def make_wait(config: Config) -> Callable[[], Awaitable[object]]:
+    if config.timer == "wheel":
+        return partial(TimerWheel().sleep, config.sleep_time)
+    if config.timer == "ticker":
+        return Ticker(config.sleep_time).wait
+    return partial(asyncio.sleep, config.sleep_time)
+
+
+async def main(config: Config) -> Report:
+    report = Report(config)
+    queue = make_queue(config)
+    wait = make_wait(config)
+    tasks = [asyncio.create_task(count(queue, wait)) for _ in range(config.producers)]
+
+    start_time = time.perf_counter()
+    tasks.append(asyncio.create_task(queue_consumer(queue, config.batch_size, report)))
+    tasks.append(asyncio.create_task(sampler(queue, report, start_time)))
+    await asyncio.sleep(config.duration)
+    report.elapsed = time.perf_counter() - start_time
 
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
-async def main() -> None:
-    queue: asyncio.Queue[int] = asyncio.Queue()
-    tasks: set[asyncio.Task[None]] = set()
+    report.items_per_second = report.items / report.elapsed
+    report.max_depth = max((sample.depth for sample in report.samples), default=0)
+    report.max_rss = max((sample.rss for sample in report.samples), default=0)
+    if isinstance(queue, BoundedQueue):
+        report.dropped = queue.stats.dropped
+        report.rejected = queue.stats.rejected
+        report.producer_wait = queue.stats.wait_percentiles()
+    return report
 
-    def done_callback(task: asyncio.Task[None]) -> None:
-        tasks.discard(task)
-        if len(tasks) == 0:
-            done_event.set()
 
-    for _ in range(100_000):
-        task = asyncio.create_task(count(queue))
-        task.add_done_callback(lambda t: done_callback(t))
-        tasks.add(task)
+def write_report(report: Report, output_format: str) -> None:
+    if output_format == "json":
+        json.dump(dataclasses.asdict(report), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    writer = csv.DictWriter(sys.stdout, fieldnames=[f.name for f in dataclasses.fields(Sample)])
+    writer.writeheader()
+    writer.writerows(dataclasses.asdict(sample) for sample in report.samples)
 
-    await queue_consumer(queue)
 
-    while len(tasks) > 0:
-        await done_event.wait()
+def parse_args(argv: list[str] | None = None) -> Config:
+    defaults = Config()
+    parser = argparse.ArgumentParser(description="Event loop ordering and queue throughput benchmark")
+    parser.add_argument("--producers", type=int, default=defaults.producers)
+    parser.add_argument("--sleep-time", type=float, default=defaults.sleep_time, help="seconds between two puts")
+    parser.add_argument("--timer", choices=["sleep", "wheel", "ticker"], default=defaults.timer)
+    parser.add_argument("--maxsize", type=int, default=defaults.maxsize, help="queue bound, 0 for unbounded")
+    parser.add_argument("--loop", choices=available_loops(), default=defaults.loop)
+    parser.add_argument("--maxbytes", type=int, default=defaults.maxbytes, help="bounded queue memory bound")
+    parser.add_argument("--policy", type=Policy, choices=list(Policy), default=defaults.policy, help="when bounded")
+    parser.add_argument("--high-watermark", type=float, default=defaults.high_watermark, help="fraction of the bound")
+    parser.add_argument("--low-watermark", type=float, default=defaults.low_watermark, help="fraction of the bound")
+    parser.add_argument("--queue", choices=["asyncio", "batch", "bounded"], default=defaults.queue)
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size, help="items per consumer await")
+    parser.add_argument("--duration", type=float, default=defaults.duration, help="seconds")
+    parser.add_argument("--sample-interval", type=float, default=defaults.sample_interval, help="seconds")
+    parser.add_argument("--format", dest="output_format", choices=["csv", "json"], default=defaults.output_format)
+    return Config(**vars(parser.parse_args(argv)))
 
 
 if __name__ == "__main__":
+    config = parse_args()
     logging.info("=" * 80)
-    logging.info(f"Running {__file__}")
+    logging.info(f"Running {__file__} with {config}")
     logging.info("=" * 80)
-    start_time = time.time()
     try:
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=loop_factory(config.loop)) as runner:
+            report = runner.run(main(config))
     except (KeyboardInterrupt, asyncio.CancelledError):
         logging.info("Interrupted by user.")
-    elapsed = time.time() - start_time
-    logging.info(f"\nTotal test time: {elapsed:.2f} seconds")
+    else:
+        logging.info(
+            f"{report.items} items in {report.elapsed:.2f} seconds, {report.items_per_second:.0f}/s, "
+            f"{report.violations} ordering violations, max queue depth {report.max_depth}, "
+            f"max RSS {report.max_rss / 1024 / 1024:.1f} MiB"
+        )
+        if report.producer_wait is not None:
+            logging.info(
+                f"{report.dropped} dropped, {report.rejected} rejected, producer wait "
+                f"p50 {report.producer_wait.p50 * 1000:.3f}ms p99 {report.producer_wait.p99 * 1000:.3f}ms "
+                f"max {report.producer_wait.max * 1000:.3f}ms"
+            )
+        write_report(report, config.output_format)
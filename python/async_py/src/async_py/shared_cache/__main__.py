@@ -0,0 +1,101 @@
+"""
+WORKERS processes, as uvicorn workers, each calling a single_flight cached fetch on the same KEYS,
+with a TTLCache per process, then with the TTLCache in front of a SQLite file shared by the processes.
+The backend calls are counted across the processes, everything runs on a temporary file.
+"""
+
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from async_py.shared_cache.cache import SqliteCache, TieredCache, TieredStats
+from async_py.single_flight.cache import cached
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+WORKERS = 4
+KEYS = 500
+REQUESTS = 5000
+TTL = 60
+BACKEND_LATENCY = 0.005
+LOOKUPS = 10_000
+
+
+async def serve(path: str | None, seed: int) -> tuple[int, TieredStats]:
+    l2 = SqliteCache(path) if path is not None else None
+    cache = TieredCache(maxsize=KEYS, ttl=TTL, l2=l2, namespace="fetch")
+    backend_calls = 0
+
+    @cached(cache=cache)
+    async def fetch(key: int) -> dict[str, int]:
+        nonlocal backend_calls
+        backend_calls += 1
+        await asyncio.sleep(BACKEND_LATENCY)
+        return {"key": key, "value": key * key}
+
+    rng = random.Random(seed)
+    for _ in range(REQUESTS):
+        await fetch(rng.randrange(KEYS))
+    if l2 is not None:
+        l2.close()
+    return backend_calls, cache.stats
+
+
+def worker(path: str | None, seed: int) -> tuple[int, TieredStats]:
+    return asyncio.run(serve(path, seed))
+
+
+def run(name: str, path: str | None) -> None:
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(WORKERS) as executor:
+        results = list(executor.map(worker, [path] * WORKERS, range(WORKERS)))
+    elapsed = time.perf_counter() - start_time
+    backend_calls = sum(result[0] for result in results)
+    l1_hits = sum(result[1].l1_hits for result in results)
+    l2_hits = sum(result[1].l2_hits for result in results)
+    logger.info(
+        f"{name:>16}: {backend_calls} backend calls for {KEYS} keys, "
+        f"{l1_hits / (WORKERS * REQUESTS):.1%} L1 hits, {l2_hits / (WORKERS * REQUESTS):.1%} L2 hits, "
+        f"in {elapsed:.2f}s"
+    )
+
+
+def lookups(path: str) -> None:
+    l2 = SqliteCache(path)
+    cache = TieredCache(maxsize=KEYS, ttl=TTL, l2=l2, namespace="lookups")
+    for key in range(KEYS):
+        cache[key] = {"key": key, "value": key * key}
+
+    start_time = time.perf_counter()
+    for i in range(LOOKUPS):
+        cache[i % KEYS]
+    l1_elapsed = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for i in range(LOOKUPS):
+        l2.get("lookups", i % KEYS)
+    l2_elapsed = time.perf_counter() - start_time
+    l2.close()
+    logger.info(
+        f"Lookup cost: L1 {l1_elapsed / LOOKUPS * 1_000_000:.2f}us, L2 {l2_elapsed / LOOKUPS * 1_000_000:.2f}us"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "cache.db")
+        run("L1 only", None)
+        run("L1 + SQLite L2", path)
+        lookups(path)
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    main()
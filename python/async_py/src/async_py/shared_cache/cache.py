@@ -0,0 +1,205 @@
+"""
+Two level cache: the TTLCache of each process in front of a SQLite file shared by the processes of the host.
+
+Every uvicorn worker warms its own TTLCache, with 4 workers the backend sees 4 misses per key and per ttl.
+TieredCache keeps the TTLCache as L1 and adds a SqliteCache as L2: a miss in L1 reads L2 before the backend,
+and what one process caches, the others read from L2.
+    cache = TieredCache(maxsize=1024, ttl=60, l2=SqliteCache("/tmp/cache.db"), namespace="fetch")
+    @cached(cache=cache)  # single_flight.cached, or any decorator taking a MutableMapping
+    async def fetch(zone: str) -> str: ...
+
+Both levels agree on:
+- TTL: an entry expires at the wall clock time it was first set plus `ttl`, in both levels,
+  an entry read from L2 keeps that expiry time in L1 instead of restarting its ttl
+- serialization: values are pickled in L2, keys are encoded in a canonical form which does not depend
+  on the hash seed of the process, frozensets included (cache_key.structural_key makes some),
+  and where equal numbers are one key as they are in L1
+- failures: an L2 that fails to read, write or unpickle is counted in `l2_errors` and treated as a miss
+
+The SQLite file is in WAL mode: readers do not block the writer nor each other.
+The calls are made on the loop thread, a local read costs tens of microseconds, less than a hop to a thread would.
+So a call waits at most a few milliseconds for a lock held by another process, then gives up:
+the read is a miss, the write is skipped, both counted in `l2_errors`.
+"""
+
+import os
+import pickle
+import sqlite3
+import time
+from collections.abc import Callable, Hashable, Iterator, MutableMapping
+from dataclasses import dataclass
+from typing import Any
+
+from cachetools import TTLCache
+
+_PURGE_EVERY = 1000
+# Seconds a call waits for the lock of another process, on the loop thread.
+_BUSY_TIMEOUT = 0.005
+# Failures of the optional L2, the call goes on with L1 and the backend: pickling or unpickling a key or a value
+# (a class renamed since the value was written), a busy or broken SQLite file.
+_L2_ERRORS = (sqlite3.Error, pickle.PickleError, AttributeError, ImportError, EOFError, TypeError)
+
+
+def encode_key(key: Any) -> str:
+    """
+    Same string for equal keys in every process: frozensets are sorted, other objects are pickled.
+    Numbers equal in Python are one key, as in L1: 1, 1.0 and True are all encoded "1".
+    """
+    key_type = type(key)
+    if key_type is float and not key.is_integer():
+        return repr(key)
+    if key_type in (int, float, bool):
+        return repr(int(key))
+    if key_type in (str, bytes, type(None)):
+        return repr(key)
+    if isinstance(key, tuple):
+        return f"({','.join([encode_key(item) for item in key])})"
+    if isinstance(key, frozenset):
+        return f"{{{','.join(sorted([encode_key(item) for item in key]))}}}"
+    if isinstance(key, type):
+        return f"<{key.__module__}.{key.__qualname__}>"
+    return f"<pickle {pickle.dumps(key).hex()}>"
+
+
+class SqliteCache:
+    """
+    One connection per process: a connection inherited through fork is not used, a new one is opened.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], timer: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.timer = timer
+        self._connection: sqlite3.Connection | None = None
+        self._pid = 0
+        self._writes = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=_BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+            )
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "namespace TEXT, key TEXT, value BLOB, expires_at REAL, PRIMARY KEY (namespace, key)"
+                    ") WITHOUT ROWID"
+                )
+            except sqlite3.Error:
+                connection.close()  # busy, the next call tries again
+                raise
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, namespace: str, key: Hashable) -> tuple[Any, float] | None:
+        """
+        The value and its expiry time, None when missing or expired.
+        """
+        row = self.connection.execute(
+            "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (namespace, encode_key(key), self.timer()),
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), row[1]  # noqa: S301, written by the processes of this host
+
+    def set(self, namespace: str, key: Hashable, value: Any, expires_at: float) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+            (namespace, encode_key(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires_at),
+        )
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            self.purge()
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+        self.connection.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, encode_key(key)))
+
+    def purge(self) -> int:
+        """
+        Delete the expired entries, of every namespace.
+        """
+        return self.connection.execute("DELETE FROM entries WHERE expires_at <= ?", (self.timer(),)).rowcount
+
+    def clear(self, namespace: str) -> None:
+        self.connection.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+
+    def close(self) -> None:
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+
+@dataclass
+class TieredStats:
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    l2_errors: int = 0
+
+
+class TieredCache(MutableMapping[Hashable, Any]):
+    """
+    Iteration and len() only see L1, what this process has at hand.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        l2: SqliteCache | None = None,
+        namespace: str = "",
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.l2 = l2
+        self.namespace = namespace
+        self.timer = timer
+        self.l1: TTLCache[Hashable, tuple[Any, float]] = TTLCache(maxsize=maxsize, ttl=ttl, timer=timer)
+        self.stats = TieredStats()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        entry = self.l1.get(key)
+        if entry is not None and entry[1] > self.timer():
+            self.stats.l1_hits += 1
+            return entry[0]
+        if self.l2 is not None:
+            try:
+                entry = self.l2.get(self.namespace, key)
+            except _L2_ERRORS:
+                self.stats.l2_errors += 1
+                entry = None
+            if entry is not None:
+                self.stats.l2_hits += 1
+                self.l1[key] = entry
+                return entry[0]
+        self.stats.misses += 1
+        raise KeyError(key)
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        expires_at = self.timer() + self.ttl
+        self.l1[key] = (value, expires_at)
+        if self.l2 is not None:
+            try:
+                self.l2.set(self.namespace, key, value, expires_at)
+            except _L2_ERRORS:
+                self.stats.l2_errors += 1
+
+    def __delitem__(self, key: Hashable) -> None:
+        found = self.l1.pop(key, None) is not None
+        if self.l2 is not None:
+            try:
+                self.l2.delete(self.namespace, key)
+            except _L2_ERRORS:
+                self.stats.l2_errors += 1
+        if not found:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.l1)
+
+    def __len__(self) -> int:
+        return len(self.l1)
@@ -1,29 +1,16 @@
 import asyncio
 import functools
 import logging
-import signal
 from collections.abc import AsyncGenerator
 
+from async_py.event_loop.loop import signal_loop_factory
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
 
-# The custom signal handling loop factory
-def _get_loop_with_signal_handling() -> asyncio.AbstractEventLoop:
-    loop = asyncio.new_event_loop()
-
-    def cancel_all_tasks() -> None:
-        for task in asyncio.all_tasks(loop):
-            task.cancel()
-
-    for sig in [signal.SIGINT, signal.SIGTERM]:
-        loop.add_signal_handler(sig, cancel_all_tasks)
-
-    return loop
-
-
-# Custom asyncio runner that uses the signal handling loop
-SignalRunner = functools.partial(asyncio.Runner, loop_factory=_get_loop_with_signal_handling)
+# Custom asyncio runner whose loop, on uvloop when it is installed, cancels all tasks on SIGINT and SIGTERM
+SignalRunner = functools.partial(asyncio.Runner, loop_factory=signal_loop_factory())
 
 
 async def infinite_loop() -> None:
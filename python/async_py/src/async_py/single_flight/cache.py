@@ -0,0 +1,76 @@
+"""
+Async cached decorator which coalesces concurrent callers for the same key.
+
+The first caller for a key starts the coroutine in its own task and registers it as in-flight.
+Every other caller arriving before it completes awaits that same task instead of hitting the backend.
+Callers for different keys never wait on each other, so no global lock is needed.
+"""
+
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable, Coroutine, Hashable, MutableMapping
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+from cachetools.keys import hashkey
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+
+def cached[**P, T](
+    cache: MutableMapping[Hashable, Any] | None,
+    key: Callable[..., Hashable] = hashkey,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Coroutine[Any, Any, T]]]:
+    """
+    Same signature as asyncache.cached, minus the lock which is not needed anymore.
+
+    The backend call runs in its own task and callers await it through asyncio.shield,
+    so a cancelled caller does not cancel the call the other callers are waiting on.
+    """
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Coroutine[Any, Any, T]]:
+        in_flight: dict[Hashable, asyncio.Future[T]] = {}
+        stats = CacheStats()
+
+        def done_callback(k: Hashable, future: asyncio.Future[T]) -> None:
+            if in_flight.get(k) is future:
+                del in_flight[k]
+            if cache is None or future.cancelled() or future.exception() is not None:
+                return
+            with suppress(ValueError):  # value too large
+                cache[k] = future.result()
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            k = key(*args, **kwargs)
+            if cache is not None:
+                try:
+                    value: T = cache[k]
+                except KeyError:
+                    pass
+                else:
+                    stats.hits += 1
+                    return value
+
+            future = in_flight.get(k)
+            if future is None:
+                stats.misses += 1
+                future = asyncio.ensure_future(func(*args, **kwargs))
+                future.add_done_callback(functools.partial(done_callback, k))
+                in_flight[k] = future
+            else:
+                stats.coalesced += 1
+            return await asyncio.shield(future)
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        wrapper.in_flight = in_flight  # type: ignore[attr-defined]
+        wrapper.stats = stats  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
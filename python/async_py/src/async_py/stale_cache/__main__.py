@@ -0,0 +1,97 @@
+"""
+Latency of callers across expiry boundaries, with a plain TTL cache and with stale-while-revalidate.
+
+With a TTL cache the first callers after each expiry pay the backend latency.
+With stale-while-revalidate they get the stale value while a background task refreshes it.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from cachetools import TTLCache
+
+from async_py.single_flight.cache import cached as ttl_cached
+from async_py.stale_cache.cache import cached as stale_cached
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+BACKEND_LATENCY = 0.1
+TTL = 0.5
+CALLERS = 20
+ROUNDS = 60
+ROUND_INTERVAL = 0.05
+
+
+async def backend(zone: str) -> str:
+    await asyncio.sleep(BACKEND_LATENCY)
+    return f"time in {zone}"
+
+
+@ttl_cached(cache=TTLCache(maxsize=128, ttl=TTL))
+async def fetch_ttl(zone: str) -> str:
+    return await backend(zone)
+
+
+@stale_cached(ttl=TTL, hard_ttl=TTL * 4, max_refreshes=8)
+async def fetch_stale(zone: str) -> str:
+    return await backend(zone)
+
+
+flaky_calls = 0
+
+
+@stale_cached(ttl=0.1, hard_ttl=0.3)
+async def fetch_flaky(zone: str) -> str:
+    global flaky_calls
+    flaky_calls += 1
+    if flaky_calls > 1:
+        raise RuntimeError(f"Backend is down for {zone}")
+    return await backend(zone)
+
+
+async def timed(fetch: Callable[[str], Awaitable[str]], zone: str) -> float:
+    start_time = time.perf_counter()
+    await fetch(zone)
+    return time.perf_counter() - start_time
+
+
+async def measure(name: str, fetch: Callable[[str], Awaitable[str]]) -> None:
+    await fetch("Asia/Tokyo")  # warm up, the cold start is the same for both
+    latencies: list[float] = []
+    for _ in range(ROUNDS):
+        latencies += await asyncio.gather(*[timed(fetch, "Asia/Tokyo") for _ in range(CALLERS)])
+        await asyncio.sleep(ROUND_INTERVAL)
+    percentiles = statistics.quantiles(latencies, n=100)
+    logger.info(
+        f"{name:>24}: p50 {percentiles[49] * 1000:.2f}ms, p99 {percentiles[98] * 1000:.2f}ms, "
+        f"max {max(latencies) * 1000:.2f}ms"
+    )
+
+
+async def main() -> None:
+    await measure("ttl", fetch_ttl)
+    await measure("stale-while-revalidate", fetch_stale)
+    logger.debug(f"{fetch_stale.stats=}")  # type: ignore[attr-defined]
+
+    # A failing refresh is logged by the supervisor and the stale value is served until hard_ttl.
+    await fetch_flaky("Europe/Paris")
+    await asyncio.sleep(0.1)
+    logger.debug(await fetch_flaky("Europe/Paris"))
+    await asyncio.sleep(0.2)
+    try:
+        await fetch_flaky("Europe/Paris")
+    except RuntimeError as error:
+        logger.debug(error)
+
+    await fetch_stale.supervisor.close()  # type: ignore[attr-defined]
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+"""
+Async cached decorator with a stale-while-revalidate mode.
+
+Fresh for `ttl` seconds, a value is then served stale until `hard_ttl` while one background task refreshes it.
+Past `hard_ttl` the value is dropped and the next callers wait for the backend, coalesced on a single call.
+Background refreshes are owned by a RefreshSupervisor, the same idea as the Nursery:
+it keeps a reference on its tasks, logs their errors and cancels them on close.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from collections.abc import Awaitable, Callable, Coroutine, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from cachetools import LRUCache
+from cachetools.keys import hashkey
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StaleStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    skipped_refreshes: int = 0
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class RefreshSupervisor:
+    """
+    Owns the background refresh tasks, at most `max_concurrency` of them at a time.
+    """
+
+    def __init__(self, max_concurrency: int | None = None) -> None:
+        self.tasks: dict[Hashable, asyncio.Task[Any]] = {}
+        self.max_concurrency = max_concurrency
+        self.errors = 0
+
+    def is_full(self) -> bool:
+        return self.max_concurrency is not None and len(self.tasks) >= self.max_concurrency
+
+    def start(self, key: Hashable, coroutine: Coroutine[Any, Any, Any]) -> None:
+        task = asyncio.create_task(coroutine)
+        task.add_done_callback(functools.partial(self.done_callback, key))
+        self.tasks[key] = task
+
+    def done_callback(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self.tasks.get(key) is task:
+            del self.tasks[key]
+        if task.cancelled():
+            return
+        if (error := task.exception()) is not None:
+            self.errors += 1
+            logger.warning(f"Refresh of {key} failed, keep serving the stale value", exc_info=error)
+
+    async def close(self) -> None:
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def cached[**P, T](
+    ttl: float,
+    hard_ttl: float,
+    maxsize: int = 128,
+    key: Callable[..., Hashable] = hashkey,
+    max_refreshes: int | None = None,
+    timer: Callable[[], float] = time.monotonic,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Coroutine[Any, Any, T]]]:
+    """
+    `hard_ttl - ttl` is the grace window during which a stale value is still served.
+    `max_refreshes` caps how many refreshes run at the same time, over the cap the stale value is served
+    and the refresh is left to a later caller.
+    """
+    if hard_ttl < ttl:
+        raise ValueError(f"hard_ttl ({hard_ttl}) must be greater or equal to ttl ({ttl})")
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Coroutine[Any, Any, T]]:
+        entries: LRUCache[Hashable, _Entry] = LRUCache(maxsize=maxsize)
+        in_flight: dict[Hashable, asyncio.Future[T]] = {}
+        supervisor = RefreshSupervisor(max_refreshes)
+        stats = StaleStats()
+
+        async def load(k: Hashable, *args: P.args, **kwargs: P.kwargs) -> T:
+            value = await func(*args, **kwargs)
+            now = timer()
+            entries[k] = _Entry(value, now + ttl, now + hard_ttl)
+            return value
+
+        def done_callback(k: Hashable, future: asyncio.Future[T]) -> None:
+            if in_flight.get(k) is future:
+                del in_flight[k]
+            if not future.cancelled():
+                future.exception()  # retrieved by the waiters, or dropped if they were all cancelled
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            k = key(*args, **kwargs)
+            entry = entries.get(k)
+            if entry is not None:
+                now = timer()
+                if now < entry.fresh_until:
+                    stats.hits += 1
+                    return entry.value  # type: ignore[no-any-return]
+                if now < entry.stale_until:
+                    stats.stale_hits += 1
+                    if k not in in_flight and k not in supervisor.tasks:
+                        if supervisor.is_full():
+                            stats.skipped_refreshes += 1
+                        else:
+                            stats.refreshes += 1
+                            supervisor.start(k, load(k, *args, **kwargs))
+                    return entry.value  # type: ignore[no-any-return]
+                entries.pop(k, None)
+
+            future = in_flight.get(k)
+            if future is None:
+                stats.misses += 1
+                future = asyncio.ensure_future(load(k, *args, **kwargs))
+                future.add_done_callback(functools.partial(done_callback, k))
+                in_flight[k] = future
+            else:
+                stats.coalesced += 1
+            return await asyncio.shield(future)
+
+        wrapper.cache = entries  # type: ignore[attr-defined]
+        wrapper.supervisor = supervisor  # type: ignore[attr-defined]
+        wrapper.stats = stats  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
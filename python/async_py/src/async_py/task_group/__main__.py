@@ -5,9 +5,7 @@ Asyncio TaskGroup replaces the concept of a nursery to create, delete tasks and
 import asyncio
 import logging
 
-from tenacity import RetryCallState, retry
-from tenacity.retry import retry_if_exception_type
-from tenacity.stop import stop_after_attempt
+from async_py.retry.retry import retry
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
@@ -22,16 +20,7 @@ async def sleep_talking(msg: str, number: int | None = None, *, is_true: bool =
     logger.debug(msg, number, is_true)
 
 
-def after_print(state: RetryCallState) -> None:
-    logger.debug(f"Failed {state.attempt_number} time(s)")
-
-
-@retry(
-    stop=stop_after_attempt(3),
-    retry=retry_if_exception_type(CustomError),
-    after=after_print,
-    reraise=True,
-)
+@retry(attempts=3, retry_on=CustomError, base=0.05)
 async def raise_custom() -> None:
     await asyncio.sleep(0.1)
     raise CustomError("This is a custom error")
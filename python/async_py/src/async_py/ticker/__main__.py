@@ -0,0 +1,55 @@
+"""
+CPU spent on timers by many periodic coroutines, as the producers of sequence_failure.
+
+Each coroutine waits `INTERVAL` seconds `ROUNDS` times:
+with its own asyncio.sleep, with its own timer in a TimerWheel, or subscribed to a shared Ticker.
+The timer overhead is what each costs above a run without timers, every coroutine yielding with sleep(0).
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+
+from async_py.ticker.wheel import Ticker, TimerWheel
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+COROUTINES = 100_000
+ROUNDS = 5
+INTERVAL = 0.5
+
+
+async def periodic(wait: Callable[[], Awaitable[object]]) -> None:
+    for _ in range(ROUNDS):
+        await wait()
+
+
+async def run(name: str, wait: Callable[[], Awaitable[object]], baseline: float = 0) -> float:
+    start_time, start_cpu = time.perf_counter(), time.process_time()
+    await asyncio.gather(*[periodic(wait) for _ in range(COROUTINES)])
+    elapsed, cpu = time.perf_counter() - start_time, time.process_time() - start_cpu
+    logger.info(f"{name:>13}: {elapsed:.2f}s wall, {cpu:.2f}s CPU")
+    if baseline:
+        overhead = cpu - baseline
+        logger.info(
+            f"{name:>13}: timer overhead {overhead / ROUNDS * 1000:.0f}ms CPU per tick, "
+            f"{overhead / COROUTINES / ROUNDS * 1e6:.2f}us per wait"
+        )
+    return cpu
+
+
+async def main() -> None:
+    baseline = await run("sleep(0)", partial(asyncio.sleep, 0))
+    await run("asyncio.sleep", partial(asyncio.sleep, INTERVAL), baseline)
+    await run("TimerWheel", partial(TimerWheel().sleep, INTERVAL), baseline)
+    await run("Ticker", Ticker(INTERVAL).wait, baseline)
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
@@ -0,0 +1,182 @@
+"""
+A hierarchical timer wheel, and a shared ticker built on it.
+
+Every asyncio.sleep() pushes a TimerHandle on the loop's heap and pops it when due: O(log n) each way,
+and with 100k sleeping coroutines the heap is what the loop spends its time on.
+
+The wheel rounds deadlines up to its `resolution` and drops each timer in the slot of its tick: O(1) each way.
+Level 0 has one slot per tick, each slot of level 1 covers a whole turn of level 0 and so on,
+when a level completes a turn the next slot of the level above is cascaded down.
+A single loop handle drives the wheel, once per tick and only while timers are pending.
+Timers never fire early, up to one `resolution` late.
+
+The ticker goes further for periodic work: all its subscribers wait on the same tick, one timer for all of them,
+and are woken in a single pass.
+"""
+
+import asyncio
+import math
+from collections.abc import Callable
+from typing import Any
+
+
+class Timer:
+    __slots__ = ("args", "callback", "tick")
+
+    def __init__(self, tick: int, callback: Callable[..., Any], args: tuple[Any, ...]) -> None:
+        self.tick = tick
+        self.callback: Callable[..., Any] | None = callback
+        self.args = args
+
+    def cancel(self) -> None:
+        """
+        The timer stays in its slot and is skipped when it comes up.
+        """
+        self.callback = None
+        self.args = ()
+
+    def cancelled(self) -> bool:
+        return self.callback is None
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class TimerWheel:
+    def __init__(self, resolution: float = 0.01, slots: int = 256, levels: int = 4) -> None:
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.fired = 0
+        self.ticks = 0
+        self._wheels: list[list[list[Timer]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._tick = 0
+        self._pending = 0
+        self._start = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._handle: asyncio.TimerHandle | None = None
+
+    def __len__(self) -> int:
+        """
+        Pending timers, cancelled ones included until their slot comes up.
+        """
+        return self._pending
+
+    def _insert(self, timer: Timer) -> None:
+        """
+        Into the lowest level where the timer is less than one turn away, counted in slots of that level.
+        """
+        width = 1
+        for level in range(self.levels):
+            slot = timer.tick // width
+            if slot - self._tick // width < self.slots:
+                self._wheels[level][slot % self.slots].append(timer)
+                return
+            width *= self.slots
+        # Beyond the range of the wheel: parked in the furthest slot of the last level, re-inserted when cascaded.
+        width //= self.slots
+        self._wheels[-1][(self._tick // width - 1) % self.slots].append(timer)
+
+    def call_at(self, when: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        loop = self._loop = self._loop or asyncio.get_running_loop()
+        if self._handle is None:
+            # Idle wheel: restart from the current time.
+            self._start = loop.time()
+            self._tick = 0
+        tick = max(math.ceil((when - self._start) / self.resolution), self._tick + 1)
+        timer = Timer(tick, callback, args)
+        self._insert(timer)
+        self._pending += 1
+        if self._handle is None:
+            self._schedule()
+        return timer
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        loop = self._loop = self._loop or asyncio.get_running_loop()
+        return self.call_at(loop.time() + delay, callback, *args)
+
+    async def sleep(self, delay: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        timer = self.call_later(delay, _wake, future)
+        try:
+            await future
+        finally:
+            timer.cancel()
+
+    def _schedule(self) -> None:
+        assert self._loop is not None
+        self._handle = self._loop.call_at(self._start + (self._tick + 1) * self.resolution, self._run)
+
+    def _run(self) -> None:
+        """
+        Catches up on every tick elapsed since the last run, the loop may be late.
+        """
+        assert self._loop is not None
+        now = int((self._loop.time() - self._start) / self.resolution)
+        while self._tick < now and self._pending:
+            self._advance()
+        self._handle = None
+        if self._pending:
+            self._tick = max(self._tick, now)
+            self._schedule()
+
+    def _advance(self) -> None:
+        self._tick += 1
+        self.ticks += 1
+        tick, slots = self._tick, self.slots
+        level, width = 1, slots
+        while level < self.levels and tick % width == 0:
+            # A turn completed: cascade the next slot of the level above.
+            index = (tick // width) % slots
+            timers, self._wheels[level][index] = self._wheels[level][index], []
+            for timer in timers:
+                self._insert(timer)
+            level, width = level + 1, width * slots
+
+        index = tick % slots
+        timers, self._wheels[0][index] = self._wheels[0][index], []
+        self._pending -= len(timers)
+        for timer in timers:
+            if timer.callback is not None:
+                self.fired += 1
+                timer.callback(*timer.args)
+
+
+class Ticker:
+    """
+    Periodic ticks of `interval`, shared by all subscribers.
+    It only ticks while someone waits: the first wait() after an idle period starts it again from the current time.
+    """
+
+    def __init__(self, interval: float, wheel: TimerWheel | None = None) -> None:
+        self.interval = interval
+        self.wheel = wheel or TimerWheel(resolution=interval / 100)
+        self.ticks = 0
+        self._next = 0.0
+        self._timer: Timer | None = None
+        self._waiters: list[asyncio.Future[None]] = []
+
+    async def wait(self) -> int:
+        """
+        Waits for the next tick, returns its number.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiters.append(future)
+        if self._timer is None:
+            self._next = loop.time() + self.interval
+            self._timer = self.wheel.call_at(self._next, self._tick)
+        await future
+        return self.ticks
+
+    def _tick(self) -> None:
+        self.ticks += 1
+        waiters, self._waiters = self._waiters, []
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+        # Subscribers woken now wait again on their next step, keep ticking on schedule for them.
+        self._next += self.interval
+        self._timer = self.wheel.call_at(self._next, self._tick) if waiters else None
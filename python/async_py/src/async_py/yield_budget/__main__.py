@@ -0,0 +1,79 @@
+"""
+CPU bound loops as Runnable.run or sequence.say_my_name, yielding on every iteration or on a time budget,
+next to a heartbeat task waking up every millisecond: its lag is how long the loops held the event loop.
+"""
+
+import asyncio
+import logging
+import time
+
+from async_py.yield_budget.budget import YieldBudget
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+WORKERS = 4
+DURATION = 1
+HEARTBEAT = 0.001
+
+
+def step() -> int:
+    return sum(range(50))
+
+
+async def every_iteration(deadline: float) -> tuple[int, int]:
+    iterations = 0
+    while time.monotonic() < deadline:
+        step()
+        await asyncio.sleep(0)
+        iterations += 1
+    return iterations, 0
+
+
+async def on_budget(deadline: float, budget_us: float) -> tuple[int, int]:
+    budget = YieldBudget(budget_us)
+    iterations = 0
+    while time.monotonic() < deadline:
+        step()
+        await budget.checkpoint()
+        iterations += 1
+    return iterations, budget.skipped
+
+
+async def heartbeat(deadline: float) -> float:
+    loop = asyncio.get_running_loop()
+    max_lag = 0.0
+    while time.monotonic() < deadline:
+        expected = loop.time() + HEARTBEAT
+        await asyncio.sleep(HEARTBEAT)
+        max_lag = max(max_lag, loop.time() - expected)
+    return max_lag
+
+
+async def run(name: str, budget_us: float | None) -> None:
+    deadline = time.monotonic() + DURATION
+    lag_task = asyncio.create_task(heartbeat(deadline))
+    if budget_us is None:
+        results = await asyncio.gather(*[every_iteration(deadline) for _ in range(WORKERS)])
+    else:
+        results = await asyncio.gather(*[on_budget(deadline, budget_us) for _ in range(WORKERS)])
+    max_lag = await lag_task
+    iterations = sum(result[0] for result in results)
+    skipped = sum(result[1] for result in results)
+    logger.info(
+        f"{name:>14}: {iterations / DURATION:9.0f} iterations/s, {skipped / max(iterations, 1):6.1%} yields skipped, "
+        f"heartbeat max lag {max_lag * 1000:.2f}ms"
+    )
+
+
+async def main() -> None:
+    await run("every iteration", None)
+    for budget_us in [100, 500, 2000]:
+        await run(f"{budget_us}us budget", budget_us)
+
+
+if __name__ == "__main__":
+    logger.info("=" * 80)
+    logger.info(f"Running {__file__}")
+    logger.info("=" * 80)
+    asyncio.run(main())
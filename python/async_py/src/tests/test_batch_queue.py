@@ -0,0 +1,38 @@
+import asyncio
+
+from async_py.batch_queue.queue import BatchQueue
+
+
+async def blocked_putters(queue: BatchQueue[int], count: int) -> list[asyncio.Task[None]]:
+    putters = [asyncio.create_task(queue.put(i)) for i in range(count)]
+    await asyncio.sleep(0)
+    return putters
+
+
+async def test_get_wakes_one_putter() -> None:
+    queue: BatchQueue[int] = BatchQueue(maxsize=1)
+    queue.put_nowait(-1)
+    putters = await blocked_putters(queue, 1000)
+
+    queue.get_nowait()
+
+    assert len(queue._putters) == 999  # noqa: SLF001
+    await asyncio.sleep(0)
+    assert sum(putter.done() for putter in putters) == 1
+    for putter in putters:
+        putter.cancel()
+
+
+async def test_get_many_wakes_one_putter_per_item() -> None:
+    queue: BatchQueue[int] = BatchQueue(maxsize=10)
+    queue.put_many_nowait(range(10))
+    putters = await blocked_putters(queue, 100)
+
+    assert queue.get_many_nowait(3) == [0, 1, 2]
+
+    assert len(queue._putters) == 97  # noqa: SLF001
+    await asyncio.sleep(0)
+    assert sum(putter.done() for putter in putters) == 3
+    assert queue.full()
+    for putter in putters:
+        putter.cancel()
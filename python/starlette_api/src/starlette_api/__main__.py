@@ -14,6 +14,7 @@ from starlette.routing import Mount, Route
 from starlette.types import Lifespan
 
 from starlette_api.database.db_client import DatabaseClient
+from starlette_api.disconnect import CancelOnDisconnectMiddleware, DisconnectStats
 from starlette_api.mounts.planets import planets_routes
 from starlette_api.state import State
 
@@ -52,13 +53,15 @@ async def health(_request: Request) -> PlainTextResponse:
 
 
 def build_app(lifespan: Lifespan[Starlette] = default_lifespan) -> Starlette:
-    return Starlette(
+    disconnect_stats = DisconnectStats()
+    app = Starlette(
         debug=True,
         routes=[
             Mount("/planets", routes=planets_routes),
             Route("/", root),
         ],
         middleware=[
+            Middleware(CancelOnDisconnectMiddleware, stats=disconnect_stats),
             Middleware(
                 CORSMiddleware,
                 allow_origins=["*"],
@@ -70,6 +73,8 @@ def build_app(lifespan: Lifespan[Starlette] = default_lifespan) -> Starlette:
         ],
         lifespan=lifespan,
     )
+    app.state.disconnect_stats = disconnect_stats
+    return app
 
 
 if __name__ == "__main__":
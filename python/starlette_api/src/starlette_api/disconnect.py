@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DisconnectStats:
+    abandoned: int = 0
+    abandoned_seconds: float = 0
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    Cancels the request handler when the client disconnects, so that CancelledError reaches the work in progress.
+
+    The messages from the server are read by a watcher task and handed over to the application through a queue
+    of one message: the application receives them as before, the body one chunk at a time as it reads it,
+    and an `http.disconnect` cancels the handler even if it never reads.
+    A disconnect during an upload the application is not reading is only seen once it takes the pending chunk.
+    Once the last chunk of the response is sent, the server reports a disconnect for every request:
+    it is passed on to the application without cancelling it, its background tasks still run.
+    `stats` counts the requests abandoned and how long their handlers had been running.
+    """
+
+    def __init__(self, app: ASGIApp, stats: DisconnectStats | None = None) -> None:
+        self.app = app
+        self.stats = stats or DisconnectStats()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+        responded = asyncio.Event()
+
+        async def send_response(message: Message) -> None:
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                responded.set()
+            await send(message)
+
+        start_time = time.perf_counter()
+        handler = asyncio.ensure_future(self.app(scope, messages.get, send_response))
+        watcher = asyncio.create_task(self._watch(receive, messages, handler, responded))
+        try:
+            await handler
+        except asyncio.CancelledError:
+            current_task = asyncio.current_task()
+            if (
+                not watcher.done()
+                or watcher.cancelled()
+                or responded.is_set()
+                or (current_task and current_task.cancelling())
+            ):
+                raise
+            self.stats.abandoned += 1
+            self.stats.abandoned_seconds += time.perf_counter() - start_time
+            logger.info(f"Client disconnected, cancelled {scope['method']} {scope['path']}")
+        finally:
+            watcher.cancel()
+
+    @staticmethod
+    async def _watch(
+        receive: Receive,
+        messages: asyncio.Queue[Message],
+        handler: asyncio.Future[None],
+        responded: asyncio.Event,
+    ) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                if not responded.is_set():
+                    handler.cancel()
+                with suppress(asyncio.QueueFull):  # the handler left a message unread, it does not need this one
+                    messages.put_nowait(message)
+                return
+            await messages.put(message)
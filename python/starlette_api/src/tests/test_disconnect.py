@@ -0,0 +1,139 @@
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message, Scope
+from starlette_api.disconnect import CancelOnDisconnectMiddleware, DisconnectStats
+
+
+def build_slow_app(events: list[str]) -> Starlette:
+    async def slow(_request: Request) -> PlainTextResponse:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        return PlainTextResponse("done")
+
+    async def fast(_request: Request) -> PlainTextResponse:
+        return PlainTextResponse("done")
+
+    async def echo(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(await request.body())
+
+    async def notify() -> None:
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            events.append("background cancelled")
+            raise
+        events.append("background done")
+
+    async def background(_request: Request) -> PlainTextResponse:
+        return PlainTextResponse("done", background=BackgroundTask(notify))
+
+    return Starlette(
+        routes=[
+            Route("/slow", slow),
+            Route("/fast", fast),
+            Route("/echo", echo, methods=["POST"]),
+            Route("/background", background),
+        ]
+    )
+
+
+async def call(
+    app: ASGIApp, path: str, disconnect_after: float | None, chunks: tuple[bytes, ...] = (b"",)
+) -> list[Message]:
+    """
+    Sends the request body in `chunks`,
+    then a disconnect after `disconnect_after` seconds if the app asks for more messages.
+    With `disconnect_after=None` the disconnect comes as soon as the response is sent, as uvicorn does.
+    """
+    scope: Scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET" if chunks == (b"",) else "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    messages: list[Message] = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1} for i, chunk in enumerate(chunks)
+    ]
+    sent: list[Message] = []
+    response_complete = asyncio.Event()
+
+    async def receive() -> Message:
+        if messages:
+            return messages.pop(0)
+        if disconnect_after is None:
+            await response_complete.wait()
+        else:
+            await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_complete.set()
+
+    await app(scope, receive, send)
+    return sent
+
+
+async def test_disconnect_cancels_handler() -> None:
+    events: list[str] = []
+    stats = DisconnectStats()
+    app = CancelOnDisconnectMiddleware(build_slow_app(events), stats=stats)
+
+    sent = await asyncio.wait_for(call(app, "/slow", disconnect_after=0.05), timeout=1)
+
+    assert events == ["cancelled"]
+    assert sent == []
+    assert stats.abandoned == 1
+    assert stats.abandoned_seconds > 0
+
+
+async def test_completed_request_is_not_abandoned() -> None:
+    events: list[str] = []
+    stats = DisconnectStats()
+    app = CancelOnDisconnectMiddleware(build_slow_app(events), stats=stats)
+
+    sent = await call(app, "/fast", disconnect_after=10)
+
+    assert sent[0]["status"] == 200
+    assert sent[1]["body"] == b"done"
+    assert events == []
+    assert stats.abandoned == 0
+
+
+async def test_body_is_handed_over_in_order() -> None:
+    stats = DisconnectStats()
+    app = CancelOnDisconnectMiddleware(build_slow_app([]), stats=stats)
+
+    sent = await call(app, "/echo", disconnect_after=10, chunks=(b"a" * 10, b"b" * 10, b"c"))
+
+    assert sent[0]["status"] == 200
+    assert sent[1]["body"] == b"a" * 10 + b"b" * 10 + b"c"
+    assert stats.abandoned == 0
+
+
+async def test_disconnect_after_response_does_not_cancel_background_task() -> None:
+    events: list[str] = []
+    stats = DisconnectStats()
+    app = CancelOnDisconnectMiddleware(build_slow_app(events), stats=stats)
+
+    sent = await asyncio.wait_for(call(app, "/background", disconnect_after=None), timeout=1)
+
+    assert sent[0]["status"] == 200
+    assert events == ["background done"]
+    assert stats.abandoned == 0